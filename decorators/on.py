@@ -29,6 +29,9 @@ def on(name: str) -> RegistryDecoratorTemplate:
         def _register_class(self) -> None:
             random_class_name = f"OnClass_{uuid.uuid4().hex[:8]}"
             
+            # 依赖注入包装在注册时创建一次（是否启用集成由包装函数在调用时判断）
+            injected_func = get_framework_integration().inject_dependencies(self.fun)
+            
             # 创建支持依赖注入和调用链的执行函数
             async def execute_with_di(*args, **kwargs):
                 # 获取框架集成
@@ -40,9 +43,6 @@ def on(name: str) -> RegistryDecoratorTemplate:
                     else:
                         return self.fun(*args, **kwargs)
                 
-                # 使用依赖注入装饰器包装函数
-                injected_func = framework.inject_dependencies(self.fun)
-                
                 # 使用调用链执行注入后的函数
                 return await framework.call_chain.execute(
                     injected_func, *args, **kwargs
@@ -70,6 +70,9 @@ def command_on(
         def _register_class(self) -> None:
             random_class_name = f"CommandClass_{uuid.uuid4().hex[:8]}"
             
+            # 依赖注入包装在注册时创建一次（是否启用集成由包装函数在调用时判断）
+            injected_func = get_framework_integration().inject_dependencies(self.fun)
+            
             # 创建支持依赖注入和调用链的执行函数
             async def execute_with_di(*args, **kwargs):
                 # 获取框架集成
@@ -81,9 +84,6 @@ def command_on(
                     else:
                         return self.fun(*args, **kwargs)
                 
-                # 使用依赖注入装饰器包装函数
-                injected_func = framework.inject_dependencies(self.fun)
-                
                 # 使用调用链执行注入后的函数
                 return await framework.call_chain.execute(
                     injected_func, *args, **kwargs
@@ -96,7 +96,7 @@ def command_on(
                 "cooldown": cooldown,
                 "arg_parser": arg_parser,
                 "execute": staticmethod(execute_with_di),  # 支持依赖注入和调用链
-                "last_executed": 0,
+                "last_executed": float('-inf'),  # 基于单调时钟，确保第一次不受冷却限制
                 "cooldown_lock": asyncio.Lock(),  # 异步锁
             }
             Myclass.ClassNucleus(random_class_name, (object,), class_attrs)
@@ -112,6 +112,9 @@ def time_on(
         def _register_class(self) -> None:
             random_class_name = f"TimeHandler_{uuid.uuid4().hex[:8]}"
             
+            # 依赖注入包装在注册时创建一次（是否启用集成由包装函数在调用时判断）
+            injected_func = get_framework_integration().inject_dependencies(self.fun)
+            
             # 创建支持依赖注入和调用链的执行函数
             async def execute_with_di(*args, **kwargs):
                 # 获取框架集成
@@ -123,9 +126,6 @@ def time_on(
                     else:
                         return self.fun(*args, **kwargs)
                 
-                # 使用依赖注入装饰器包装函数
-                injected_func = framework.inject_dependencies(self.fun)
-                
                 # 使用调用链执行注入后的函数
                 return await framework.call_chain.execute(
                     injected_func, *args, **kwargs
@@ -151,6 +151,9 @@ def re_on(
         def _register_class(self) -> None:
             random_class_name = f"ReHandler_{uuid.uuid4().hex[:8]}"
             
+            # 依赖注入包装在注册时创建一次（是否启用集成由包装函数在调用时判断）
+            injected_func = get_framework_integration().inject_dependencies(self.fun)
+            
             # 创建支持依赖注入和调用链的执行函数
             async def execute_with_di(*args, **kwargs):
                 # 获取框架集成
@@ -162,9 +165,6 @@ def re_on(
                     else:
                         return self.fun(*args, **kwargs)
                 
-                # 使用依赖注入装饰器包装函数
-                injected_func = framework.inject_dependencies(self.fun)
-                
                 # 使用调用链执行注入后的函数
                 return await framework.call_chain.execute(
                     injected_func, *args, **kwargs
@@ -2,6 +2,7 @@
 class ClassNucleus(type):
     _registry = {}  # 使用字典而不是列表
     _name_list = []
+    _version = 0  # 注册表每次变化时递增，供调度器判断缓存是否失效
 
     def __new__(cls, name, bases, attrs):
         # 检查 fun_name 属性是否存在
@@ -16,6 +17,7 @@ class ClassNucleus(type):
         # 注册类
         cls._name_list.append(fun_name)
         cls._registry[fun_name] = new_class
+        cls._version += 1
         return new_class
 
     @classmethod
@@ -23,8 +25,14 @@ class ClassNucleus(type):
         """返回已注册类的字典，键为 fun_name，值为类"""
         return cls._registry
 
+    @classmethod
+    def get_registry_version(cls):
+        """返回注册表版本号，注册或清空时变化"""
+        return cls._version
+
     @classmethod
     def clear_registry(cls):
         """清空注册表（主要用于测试）"""
         cls._registry.clear()
-        cls._name_list.clear()
\ No newline at end of file
+        cls._name_list.clear()
+        cls._version += 1
\ No newline at end of file
@@ -1,13 +1,14 @@
-from .dispatcher import EventDispatcher, DecisionCommandDispatcher, TimeTaskScheduler, ReTaskScheduler
+from .dispatcher import EventDispatcher, DecisionCommandDispatcher, TimeTaskScheduler, ReTaskScheduler, enable_uvloop
 from .Myclass import ClassNucleus
-from .data.priority_queue import PriorityQueue, ResourceController
-from .data.tree import Tree, create_default_tree
+from .data.priority_queue import PriorityQueue, BucketPriorityQueue, ResourceController
+from .data.spsc_queue import SPSCQueue
+from .data.tree import Tree, FastTree, create_default_tree
 from .core.integration import (
     enable_framework_integration, service, inject, get_framework_integration,
     get_task_manager, get_dependency_container, get_call_chain, task_with_chain
 )
 
-__all__ = ['EventDispatcher', 'DecisionCommandDispatcher', 'TimeTaskScheduler', 'ReTaskScheduler', 
-           'ClassNucleus', 'PriorityQueue', 'ResourceController', 'Tree', 'create_default_tree',
+__all__ = ['EventDispatcher', 'DecisionCommandDispatcher', 'TimeTaskScheduler', 'ReTaskScheduler', 'enable_uvloop',
+           'ClassNucleus', 'PriorityQueue', 'BucketPriorityQueue', 'ResourceController', 'SPSCQueue', 'Tree', 'FastTree', 'create_default_tree',
            'enable_framework_integration', 'service', 'inject', 'get_framework_integration',
            'get_task_manager', 'get_dependency_container', 'get_call_chain', 'task_with_chain']
\ No newline at end of file
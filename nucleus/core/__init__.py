@@ -8,7 +8,8 @@ from .chain import (
     ChainStatus,
     LoggingInterceptor,
     MetricsInterceptor,
-    TimeoutInterceptor
+    TimeoutInterceptor,
+    get_current_chain_context
 )
 
 from .di import (
@@ -22,6 +23,7 @@ from .di import (
 
 from .task_manager import (
     TaskManager,
+    TaskHandle,
     TaskInfo,
     TaskStatus,
     TaskCancellationToken,
@@ -51,6 +53,7 @@ __all__ = [
     'LoggingInterceptor',
     'MetricsInterceptor',
     'TimeoutInterceptor',
+    'get_current_chain_context',
     
     # 依赖注入
     'DependencyContainer',
@@ -62,6 +65,7 @@ __all__ = [
     
     # 任务管理
     'TaskManager',
+    'TaskHandle',
     'TaskInfo',
     'TaskStatus',
     'TaskCancellationToken',
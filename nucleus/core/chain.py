@@ -2,13 +2,17 @@
 调用链功能实现 - 支持任务执行的拦截和增强
 """
 import asyncio
+import contextvars
+import logging
 import time
 import uuid
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, List, Optional, Union, Awaitable
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union, Awaitable
 from dataclasses import dataclass, field
 from enum import Enum
 
+logger = logging.getLogger(__name__)
+
 
 class ChainStatus(Enum):
     """调用链状态"""
@@ -42,6 +46,15 @@ class ChainContext:
         return None
 
 
+# 当前协程所在的调用链上下文（随asyncio任务自动隔离，嵌套调用链按栈恢复）
+_current_chain_ctx: contextvars.ContextVar[Optional[ChainContext]] = contextvars.ContextVar('chain_ctx', default=None)
+
+
+def get_current_chain_context() -> Optional[ChainContext]:
+    """获取当前正在执行的调用链上下文"""
+    return _current_chain_ctx.get()
+
+
 class ChainInterceptor(ABC):
     """调用链拦截器基类"""
     
@@ -64,7 +77,8 @@ class CallChain:
     """调用链管理器"""
     
     def __init__(self):
-        self._interceptors: List[ChainInterceptor] = []
+        # 拦截器以元组保存（写时复制），执行时直接取快照，无需加锁或拷贝
+        self._interceptors: Tuple[ChainInterceptor, ...] = ()
         self._active_chains: Dict[str, ChainContext] = {}
         self._chain_results: Dict[str, Any] = {}
     
@@ -74,12 +88,14 @@ class CallChain:
     
     def add_interceptor(self, interceptor: ChainInterceptor) -> None:
         """添加拦截器"""
-        self._interceptors.append(interceptor)
+        self._interceptors = self._interceptors + (interceptor,)
     
     def remove_interceptor(self, interceptor: ChainInterceptor) -> None:
         """移除拦截器"""
         if interceptor in self._interceptors:
-            self._interceptors.remove(interceptor)
+            interceptors = list(self._interceptors)
+            interceptors.remove(interceptor)
+            self._interceptors = tuple(interceptors)
     
     async def execute(
         self,
@@ -103,13 +119,15 @@ class CallChain:
         )
         
         self._active_chains[chain_id] = context
+        interceptors = self._interceptors
+        token = _current_chain_ctx.set(context)
         
         try:
             # 执行前拦截
             context.status = ChainStatus.RUNNING
             context.start_time = time.time()
             
-            for interceptor in self._interceptors:
+            for interceptor in interceptors:
                 await interceptor.before_execute(context)
             
             # 执行函数
@@ -126,36 +144,40 @@ class CallChain:
             context.status = ChainStatus.FAILED
             
             # 错误处理
-            for interceptor in self._interceptors:
+            for interceptor in interceptors:
                 await interceptor.on_error(context, e)
             
             raise
         
         finally:
-            context.end_time = time.time()
-            
-            # 只有在成功执行后才调用 after_execute
-            if context.status == ChainStatus.SUCCESS:
-                for interceptor in self._interceptors:
-                    await interceptor.after_execute(context)
-            
-            # 保存结果并清理
-            self._chain_results[chain_id] = context.result
-            if chain_id in self._active_chains:
-                del self._active_chains[chain_id]
+            try:
+                context.end_time = time.time()
+                
+                # 只有在成功执行后才调用 after_execute
+                if context.status == ChainStatus.SUCCESS:
+                    for interceptor in interceptors:
+                        await interceptor.after_execute(context)
+            finally:
+                # 保存结果并清理；after_execute 抛出异常时也要恢复外层上下文
+                self._chain_results[chain_id] = context.result
+                if chain_id in self._active_chains:
+                    del self._active_chains[chain_id]
+                _current_chain_ctx.reset(token)
         
         return context.result
     
     async def execute_with_context(self, context: ChainContext) -> Any:
         """使用现有上下文执行函数"""
         self._active_chains[context.chain_id] = context
+        interceptors = self._interceptors
+        token = _current_chain_ctx.set(context)
         
         try:
             # 执行前拦截
             context.status = ChainStatus.RUNNING
             context.start_time = time.time()
             
-            for interceptor in self._interceptors:
+            for interceptor in interceptors:
                 await interceptor.before_execute(context)
             
             # 执行函数
@@ -176,23 +198,25 @@ class CallChain:
             context.status = ChainStatus.FAILED
             
             # 错误处理
-            for interceptor in self._interceptors:
+            for interceptor in interceptors:
                 await interceptor.on_error(context, e)
             
             raise
         
         finally:
-            context.end_time = time.time()
-            
-            # 只有在成功执行后才调用 after_execute
-            if context.status == ChainStatus.SUCCESS:
-                for interceptor in self._interceptors:
-                    await interceptor.after_execute(context)
-            
-            # 保存结果并清理
-            self._chain_results[context.chain_id] = context.result
-            if context.chain_id in self._active_chains:
-                del self._active_chains[context.chain_id]
+            try:
+                context.end_time = time.time()
+                
+                # 只有在成功执行后才调用 after_execute
+                if context.status == ChainStatus.SUCCESS:
+                    for interceptor in interceptors:
+                        await interceptor.after_execute(context)
+            finally:
+                # 保存结果并清理；after_execute 抛出异常时也要恢复外层上下文
+                self._chain_results[context.chain_id] = context.result
+                if context.chain_id in self._active_chains:
+                    del self._active_chains[context.chain_id]
+                _current_chain_ctx.reset(token)
         
         return context.result
     
@@ -232,14 +256,13 @@ class LoggingInterceptor(ChainInterceptor):
     """日志记录拦截器"""
     
     async def before_execute(self, context: ChainContext) -> None:
-        print(f"[Chain] 开始执行任务: {context.function_name} (ID: {context.chain_id})")
+        logger.info("[Chain] 开始执行任务: %s (ID: %s)", context.function_name, context.chain_id)
     
     async def after_execute(self, context: ChainContext) -> None:
-        duration = context.duration
-        print(f"[Chain] 任务完成: {context.function_name} (耗时: {duration:.3f}s)")
+        logger.info("[Chain] 任务完成: %s (耗时: %.3fs)", context.function_name, context.duration or 0.0)
     
     async def on_error(self, context: ChainContext, error: Exception) -> None:
-        print(f"[Chain] 任务出错: {context.function_name} - {error}")
+        logger.error("[Chain] 任务出错: %s - %s", context.function_name, error)
 
 
 class MetricsInterceptor(ChainInterceptor):
@@ -288,7 +311,7 @@ class TimeoutInterceptor(ChainInterceptor):
     async def after_execute(self, context: ChainContext) -> None:
         duration = context.duration
         if duration and duration > self.timeout_seconds:
-            print(f"[Warning] 任务 {context.function_name} 执行超时: {duration:.3f}s (限制: {self.timeout_seconds}s)")
+            logger.warning("任务 %s 执行超时: %.3fs (限制: %ss)", context.function_name, duration, self.timeout_seconds)
 
 
 # 全局调用链实例
@@ -3,12 +3,13 @@
 """
 import asyncio
 import inspect
-from typing import Any, Dict, List, Optional, Callable, Type, Union
+import weakref
+from typing import Any, Dict, List, Optional, Callable, Type, Union, Tuple
 from functools import wraps
 
 from .chain import CallChain, ChainContext, ChainInterceptor
 from .di import DependencyContainer, Injectable, Singleton, ServiceLifetime
-from .task_manager import TaskManager, TaskCancellationToken, default_task_manager
+from .task_manager import TaskManager, TaskInfo, TaskStatus, TaskCancellationToken, default_task_manager
 
 
 class FrameworkIntegration:
@@ -54,7 +55,13 @@ class FrameworkIntegration:
             async def before_execute(self, context: ChainContext) -> None:
                 # 创建任务
                 target = context.metadata.get('target')
-                if target and inspect.iscoroutinefunction(target):
+                if not target:
+                    return
+                # 优先使用装饰时缓存的结果，避免每次调用都做inspect检查
+                is_coroutine = context.metadata.get('target_is_coroutine')
+                if is_coroutine is None:
+                    is_coroutine = inspect.iscoroutinefunction(target)
+                if is_coroutine:
                     task_id = self.task_manager.create_task(
                         coro=target(*context.args, **context.kwargs),
                         name=context.function_name,
@@ -72,7 +79,7 @@ class FrameworkIntegration:
                 task_id = context.metadata.get('task_id')
                 if task_id:
                     task_info = self.task_manager.get_task_info(task_id)
-                    if task_info and task_info.status.value == 'completed':
+                    if task_info and task_info.status is TaskStatus.COMPLETED:
                         context.metadata['task_result'] = task_info.result
             
             async def on_error(self, context: ChainContext, error: Exception) -> None:
@@ -99,14 +106,15 @@ class FrameworkIntegration:
     
     def inject_dependencies(self, func: Callable) -> Callable:
         """依赖注入装饰器"""
+        # 函数签名和是否为协程函数在装饰时计算一次
+        sig = inspect.signature(func)
+        is_coroutine = inspect.iscoroutinefunction(func)
+        
         @wraps(func)
         async def wrapper(*args, **kwargs):
             if not self._integration_enabled:
                 return await func(*args, **kwargs)
             
-            # 获取函数签名
-            sig = inspect.signature(func)
-            
             # 解析依赖
             injected_kwargs = {}
             for param_name, param in sig.parameters.items():
@@ -132,7 +140,12 @@ class FrameworkIntegration:
                     func,
                     *args,
                     task_id=None,
-                    metadata={'target': func, 'args': args, 'kwargs': final_kwargs},
+                    metadata={
+                        'target': func,
+                        'target_is_coroutine': is_coroutine,
+                        'args': args,
+                        'kwargs': final_kwargs
+                    },
                     **final_kwargs
                 )
             else:
@@ -145,17 +158,14 @@ class FrameworkIntegration:
         from .di import ServiceLifetime
         
         # 注册服务到容器 - 支持接口到实现的映射
-        if hasattr(service_type, '__bases__') and service_type.__bases__:
-            # 如果有基类，注册接口到实现的映射
-            for base_class in service_type.__bases__:
-                if base_class != object:
-                    # 注册基类（接口）到实现类的映射
-                    if lifetime == 'singleton':
-                        self.container.register_singleton(base_class, service_type)
-                    elif lifetime == 'scoped':
-                        self.container.register_scoped(base_class, service_type)
-                    else:
-                        self.container.register_transient(base_class, service_type)
+        for base_class in _interface_bases(service_type):
+            # 注册基类（接口）到实现类的映射
+            if lifetime == 'singleton':
+                self.container.register_singleton(base_class, service_type)
+            elif lifetime == 'scoped':
+                self.container.register_scoped(base_class, service_type)
+            else:
+                self.container.register_transient(base_class, service_type)
         
         # 同时注册实现类自身
         if lifetime == 'singleton':
@@ -219,31 +229,36 @@ class FrameworkIntegration:
         """获取调用链"""
         return self.call_chain
     
+    @staticmethod
+    def _task_info_to_dict(task_info: TaskInfo) -> Dict[str, Any]:
+        """将任务信息转换为字典"""
+        return {
+            'task_id': task_info.task_id,
+            'name': task_info.name,
+            'status': task_info.status,
+            'created_at': task_info.created_at,
+            'started_at': task_info.started_at,
+            'completed_at': task_info.completed_at,
+            'duration': task_info.duration,
+            'wait_time': task_info.wait_time,
+            'result': task_info.result,
+            'error': str(task_info.error) if task_info.error else None,
+            'metadata': task_info.metadata,
+            'parent_task_id': task_info.parent_task_id,
+            'child_task_ids': task_info.child_task_ids
+        }
+    
     def get_task_info(self, task_id: str) -> Optional[Dict[str, Any]]:
         """获取任务信息"""
         task_info = self.task_manager.get_task_info(task_id)
         if task_info:
-            return {
-                'task_id': task_info.task_id,
-                'name': task_info.name,
-                'status': task_info.status.value,
-                'created_at': task_info.created_at,
-                'started_at': task_info.started_at,
-                'completed_at': task_info.completed_at,
-                'duration': task_info.duration,
-                'wait_time': task_info.wait_time,
-                'result': task_info.result,
-                'error': str(task_info.error) if task_info.error else None,
-                'metadata': task_info.metadata,
-                'parent_task_id': task_info.parent_task_id,
-                'child_task_ids': task_info.child_task_ids
-            }
+            return self._task_info_to_dict(task_info)
         return None
     
     def get_all_tasks_info(self) -> List[Dict[str, Any]]:
         """获取所有任务信息"""
-        all_tasks = self.task_manager.get_all_tasks()
-        return [self.get_task_info(task.task_id) for task in all_tasks if task]
+        # get_all_tasks 在一次加锁内取得快照，无需再逐个按ID查询
+        return [self._task_info_to_dict(task_info) for task_info in self.task_manager.get_all_tasks()]
     
     def cancel_task(self, task_id: str) -> bool:
         """取消任务"""
@@ -261,45 +276,61 @@ class FrameworkIntegration:
 # 全局集成器实例
 framework_integration = FrameworkIntegration()
 
-# 延迟注册的服务列表
-_pending_services = []
+# 延迟注册的服务（按服务类型去重，值为生命周期字符串）
+_pending_services: Dict[Type, str] = {}
+
+# 生命周期字符串到枚举的映射
+_LIFETIME_MAP = {
+    'singleton': ServiceLifetime.SINGLETON,
+    'scoped': ServiceLifetime.SCOPED,
+    'transient': ServiceLifetime.TRANSIENT,
+}
+
+# 服务类的接口基类缓存
+_interface_bases_cache: "weakref.WeakKeyDictionary[Type, Tuple[Type, ...]]" = weakref.WeakKeyDictionary()
+
+
+def _to_lifetime(lifetime_str: str) -> ServiceLifetime:
+    """转换字符串生命周期为枚举，未知值按瞬态处理"""
+    return _LIFETIME_MAP.get(lifetime_str, ServiceLifetime.TRANSIENT)
+
+
+def _interface_bases(service_type: Type) -> Tuple[Type, ...]:
+    """获取服务类的接口基类（排除object），每个类只计算一次"""
+    try:
+        return _interface_bases_cache[service_type]
+    except (KeyError, TypeError):
+        pass
+    
+    bases = tuple(base for base in getattr(service_type, '__bases__', ()) if base is not object)
+    try:
+        _interface_bases_cache[service_type] = bases
+    except TypeError:
+        # 不支持弱引用的类型不缓存
+        pass
+    return bases
+
+
+def _register_service_type(container: DependencyContainer, service_type: Type, lifetime: ServiceLifetime) -> None:
+    """注册服务到容器 - 支持接口到实现的映射"""
+    bases = _interface_bases(service_type)
+    if bases:
+        # 注册基类（接口）到实现类的映射
+        for base_class in bases:
+            container.register(base_class, service_type, lifetime=lifetime)
+    else:
+        # 没有基类（接口），直接注册实现类自身
+        container.register(service_type, service_type, lifetime=lifetime)
 
 
 def _register_pending_services():
     """注册所有待处理的服务"""
-    global _pending_services
+    # 创建待处理服务的副本，避免在迭代时修改
+    pending_copy = list(_pending_services.items())
+    container = framework_integration.container
     
-    # 创建待处理服务的副本，避免在迭代时修改列表
-    pending_copy = _pending_services.copy()
-    
-    for service_info in pending_copy:
-        service_type, lifetime_str = service_info
-        container = framework_integration.container
-        
-        # 转换字符串生命周期为枚举
-        if lifetime_str == 'singleton':
-            lifetime = ServiceLifetime.SINGLETON
-        elif lifetime_str == 'scoped':
-            lifetime = ServiceLifetime.SCOPED
-        else:
-            lifetime = ServiceLifetime.TRANSIENT
-        
-        # 注册服务到容器 - 支持接口到实现的映射
-        if hasattr(service_type, '__bases__') and service_type.__bases__:
-            # 如果有基类，注册接口到实现的映射
-            registered = False
-            for base_class in service_type.__bases__:
-                if base_class != object:
-                    # 注册基类（接口）到实现类的映射
-                    container.register(base_class, service_type, lifetime=lifetime)
-                    registered = True
-            
-            # 如果没有有效的基类映射，注册实现类自身
-            if not registered:
-                container.register(service_type, service_type, lifetime=lifetime)
-        else:
-            # 没有基类（接口），直接注册实现类自身
-            container.register(service_type, service_type, lifetime=lifetime)
+    for service_type, lifetime_str in pending_copy:
+        _register_service_type(container, service_type, _to_lifetime(lifetime_str))
     
     # 清空待处理列表
     _pending_services.clear()
@@ -342,37 +373,16 @@ def service(lifetime_or_interface: Union[str, Type] = 'singleton') -> Callable:
         # 如果框架已经启用，立即注册服务
         if framework_integration._integration_enabled:
             container = framework_integration.container
+            lifetime_enum = _to_lifetime(lifetime)
             
-            # 转换字符串生命周期为枚举
-            if lifetime == 'singleton':
-                lifetime_enum = ServiceLifetime.SINGLETON
-            elif lifetime == 'scoped':
-                lifetime_enum = ServiceLifetime.SCOPED
-            else:
-                lifetime_enum = ServiceLifetime.TRANSIENT
-            
-            # 注册服务到容器 - 支持接口到实现的映射
             if interface_type:
                 # 指定了接口映射
                 container.register(interface_type, service_type, lifetime=lifetime_enum)
-            elif hasattr(service_type, '__bases__') and service_type.__bases__:
-                # 有基类，注册接口到实现的映射
-                registered = False
-                for base_class in service_type.__bases__:
-                    if base_class != object:
-                        # 注册基类（接口）到实现类的映射
-                        container.register(base_class, service_type, lifetime=lifetime_enum)
-                        registered = True
-                
-                # 如果没有有效的基类映射，注册实现类自身
-                if not registered:
-                    container.register(service_type, service_type, lifetime=lifetime_enum)
             else:
-                # 没有基类（接口），直接注册实现类自身
-                container.register(service_type, service_type, lifetime=lifetime_enum)
+                _register_service_type(container, service_type, lifetime_enum)
         else:
             # 框架未启用，添加到待处理列表
-            _pending_services.append((service_type, lifetime))
+            _pending_services[service_type] = lifetime
         
         return service_type
     return decorator
@@ -2,24 +2,39 @@
 任务管理器 - 支持任务取消、状态跟踪和生命周期管理
 """
 import asyncio
+import heapq
+import itertools
+import logging
+import os
 import uuid
 import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Callable, Union, Set
+from typing import Any, Coroutine, Dict, Final, List, Optional, Callable, Union, Set, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from threading import Lock
 import weakref
 
+try:
+    from mypy_extensions import mypyc_attr
+except ImportError:  # 未安装mypy_extensions时（纯Python运行）不需要该标记
+    def mypyc_attr(*attrs: str, **kwattrs: object) -> Callable[[Any], Any]:  # type: ignore[misc]
+        return lambda cls: cls
 
-class TaskStatus(Enum):
-    """任务状态"""
+logger = logging.getLogger(__name__)
+
+
+class TaskStatus(str, Enum):
+    """任务状态（本身即为字符串，可直接与状态字符串比较和序列化）"""
     PENDING = "pending"      # 等待执行
     RUNNING = "running"      # 正在执行
     COMPLETED = "completed"  # 执行完成
     FAILED = "failed"        # 执行失败
     CANCELLED = "cancelled"  # 已取消
     TIMEOUT = "timeout"      # 执行超时
+    
+    def __str__(self) -> str:
+        return self.value
 
 
 @dataclass
@@ -55,7 +70,7 @@ class TaskInfo:
 class TaskCancellationToken:
     """任务取消令牌"""
     
-    def __init__(self):
+    def __init__(self) -> None:
         self._cancelled = False
         self._callbacks: List[Callable] = []
         self._lock = Lock()
@@ -70,7 +85,7 @@ class TaskCancellationToken:
                     try:
                         callback()
                     except Exception as e:
-                        print(f"取消回调执行失败: {e}")
+                        logger.warning("取消回调执行失败: %s", e)
     
     @property
     def is_cancelled(self) -> bool:
@@ -86,7 +101,7 @@ class TaskCancellationToken:
                 try:
                     callback()
                 except Exception as e:
-                    print(f"取消回调执行失败: {e}")
+                    logger.warning("取消回调执行失败: %s", e)
             else:
                 self._callbacks.append(callback)
     
@@ -96,34 +111,69 @@ class TaskCancellationToken:
             raise asyncio.CancelledError("任务已被取消")
 
 
+@mypyc_attr(native_class=False)
+class TaskHandle(str):
+    """任务句柄 - 即任务ID字符串，同时持有底层的asyncio.Task"""
+    
+    task: asyncio.Task
+    
+    def __new__(cls, task_id: str, task: asyncio.Task) -> 'TaskHandle':
+        handle = str.__new__(cls, task_id)
+        handle.task = task
+        return handle
+    
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # asyncio.Task 无法序列化，序列化时退化为纯任务ID字符串
+        return (str, (str(self),))
+    
+    def __copy__(self) -> 'TaskHandle':
+        return self
+    
+    def __deepcopy__(self, memo: Dict[int, Any]) -> 'TaskHandle':
+        # 句柄不可变且与底层任务一一对应，复制时直接共享
+        return self
+    
+    @property
+    def task_id(self) -> str:
+        """任务ID"""
+        return str(self)
+
+
 class TaskManager:
     """任务管理器"""
     
-    def __init__(self):
-        self._tasks: Dict[str, TaskInfo] = {}
-        self._active_tasks: Dict[str, asyncio.Task] = {}
+    def __init__(self, external_ids: bool = False) -> None:
+        self._tasks: Final[Dict[str, TaskInfo]] = {}
+        self._active_tasks: Final[Dict[str, asyncio.Task]] = {}
         self._cancellation_tokens: Dict[str, TaskCancellationToken] = {}
         self._task_callbacks: Dict[str, List[Callable]] = {}
         self._lock = Lock()
-        self._task_counter = 0
+        
+        # 进程内任务ID：前缀 + 单调计数器（需要跨进程唯一时使用uuid4）
+        self._external_ids = external_ids
+        self._pid_prefix = f"{os.getpid()}-{id(self):x}"
+        self._task_counter = itertools.count()
+        
+        # 按完成时间排序的过期索引 (completed_at, task_id)，用于增量清理
+        self._expiry_heap: List[Tuple[float, str]] = []
         
         # 使用弱引用跟踪异步任务，避免内存泄漏
         self._weak_task_refs: Dict[str, weakref.ref] = {}
     
     def create_task(
         self,
-        coro: Callable,
+        coro: Coroutine[Any, Any, Any],
         name: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None,
         parent_task_id: Optional[str] = None
-    ) -> str:
-        """创建任务"""
-        task_id = str(uuid.uuid4())
+    ) -> 'TaskHandle':
+        """创建任务，返回可直接当作任务ID使用的任务句柄"""
+        task_id = self._generate_task_id()
         
         # 创建任务信息
         task_info = TaskInfo(
             task_id=task_id,
-            name=name or coro.__name__,
+            name=name or str(getattr(coro, '__name__', 'task')),
             status=TaskStatus.PENDING,
             created_at=time.time(),
             metadata=metadata or {},
@@ -142,7 +192,7 @@ class TaskManager:
                 self._tasks[parent_task_id].child_task_ids.append(task_id)
         
         # 创建异步任务
-        async def task_wrapper():
+        async def task_wrapper() -> Any:
             try:
                 # 检查是否已取消
                 cancellation_token.throw_if_cancelled()
@@ -160,6 +210,7 @@ class TaskManager:
                     task_info.status = TaskStatus.COMPLETED
                     task_info.completed_at = time.time()
                     task_info.result = result
+                    self._push_expiry(task_info)
                 
                 return result
                 
@@ -168,6 +219,7 @@ class TaskManager:
                 with self._lock:
                     task_info.status = TaskStatus.CANCELLED
                     task_info.completed_at = time.time()
+                    self._push_expiry(task_info)
                 raise
                 
             except Exception as e:
@@ -176,11 +228,8 @@ class TaskManager:
                     task_info.status = TaskStatus.FAILED
                     task_info.completed_at = time.time()
                     task_info.error = e
+                    self._push_expiry(task_info)
                 raise
-                
-            finally:
-                # 清理
-                self._cleanup_task(task_id)
         
         # 创建并启动异步任务
         task = asyncio.create_task(task_wrapper())
@@ -189,7 +238,23 @@ class TaskManager:
             self._active_tasks[task_id] = task
             self._weak_task_refs[task_id] = weakref.ref(task)
         
-        return task_id
+        # 任务结束（包括启动前被取消）时清理资源
+        task.add_done_callback(lambda _: self._cleanup_task(task_id))
+        
+        return TaskHandle(task_id, task)
+    
+    def _generate_task_id(self) -> str:
+        """生成任务ID"""
+        if self._external_ids:
+            return str(uuid.uuid4())
+        # itertools.count 的自增在GIL下是原子的，无需加锁
+        return f"{self._pid_prefix}-{next(self._task_counter)}"
+    
+    def _push_expiry(self, task_info: TaskInfo) -> None:
+        """记录任务进入终止状态的时间（调用方需持有锁）"""
+        completed_at = task_info.completed_at
+        if completed_at is not None:
+            heapq.heappush(self._expiry_heap, (completed_at, task_info.task_id))
     
     def _cleanup_task(self, task_id: str) -> None:
         """清理任务资源"""
@@ -200,7 +265,7 @@ class TaskManager:
                 try:
                     callback()
                 except Exception as e:
-                    print(f"任务回调执行失败: {e}")
+                    logger.warning("任务回调执行失败: %s", e)
             
             # 清理资源
             if task_id in self._active_tasks:
@@ -230,6 +295,7 @@ class TaskManager:
             # 立即更新任务状态为已取消
             task_info.status = TaskStatus.CANCELLED
             task_info.completed_at = time.time()
+            self._push_expiry(task_info)
             
             # 取消异步任务（不等待其完成）
             task = self._active_tasks.get(task_id)
@@ -327,25 +393,33 @@ class TaskManager:
                     asyncio.set_event_loop(None)
             except asyncio.TimeoutError:
                 # 超时处理
-                task_info = self._tasks.get(task_id)
-                if task_info:
-                    task_info.status = TaskStatus.TIMEOUT
-                    task_info.completed_at = time.time()
+                with self._lock:
+                    task_info = self._tasks.get(task_id)
+                    if task_info:
+                        task_info.status = TaskStatus.TIMEOUT
+                        task_info.completed_at = time.time()
+                        self._push_expiry(task_info)
                 raise
         return None
     
-    async def wait_for_task_async(self, task_id: str, timeout: Optional[float] = None) -> Any:
-        """异步等待任务完成"""
-        task = self._active_tasks.get(task_id)
+    async def wait_for_task_async(self, task_id: Union[TaskHandle, str], timeout: Optional[float] = None) -> Any:
+        """异步等待任务完成，传入任务句柄时直接等待其持有的任务"""
+        task: Optional[asyncio.Task]
+        if isinstance(task_id, TaskHandle):
+            task = task_id.task
+        else:
+            task = self._active_tasks.get(task_id)
         if task:
             try:
                 return await asyncio.wait_for(task, timeout)
             except asyncio.TimeoutError:
                 # 超时处理
-                task_info = self._tasks.get(task_id)
-                if task_info:
-                    task_info.status = TaskStatus.TIMEOUT
-                    task_info.completed_at = time.time()
+                with self._lock:
+                    task_info = self._tasks.get(task_id)
+                    if task_info:
+                        task_info.status = TaskStatus.TIMEOUT
+                        task_info.completed_at = time.time()
+                        self._push_expiry(task_info)
                 raise
         return None
     
@@ -362,18 +436,20 @@ class TaskManager:
     
     def cleanup_completed_tasks(self, max_age_seconds: float = 3600) -> int:
         """清理完成任务"""
-        current_time = time.time()
+        expire_before = time.time() - max_age_seconds
         cleaned_count = 0
+        terminal_statuses = (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED, TaskStatus.TIMEOUT)
         
         with self._lock:
-            completed_tasks = [
-                task_id for task_id, task_info in self._tasks.items()
-                if (task_info.status in [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED, TaskStatus.TIMEOUT] and
-                    task_info.completed_at and
-                    current_time - task_info.completed_at > max_age_seconds)
-            ]
-            
-            for task_id in completed_tasks:
+            heap = self._expiry_heap
+            while heap and heap[0][0] < expire_before:
+                _, task_id = heapq.heappop(heap)
+                task_info = self._tasks.get(task_id)
+                # 跳过已清理或状态已变化的过期索引项
+                if task_info is None or task_info.status not in terminal_statuses:
+                    continue
+                if task_info.completed_at is None or task_info.completed_at >= expire_before:
+                    continue
                 del self._tasks[task_id]
                 cleaned_count += 1
         
@@ -1,91 +1,202 @@
-from typing import Any, List, Tuple, Optional, Iterator
+from typing import Any, ClassVar, Dict, Iterable, List, Tuple, Optional, Iterator
+from collections import deque
+from collections.abc import Mapping
 from heapq import heappush, heappop, heapify
-from threading import Lock
+import itertools
+from threading import Lock, Condition
 import time
 from .data_structure import DataStructure
 
 class PriorityQueueItem:
     """优先级队列项，封装数据和优先级"""
     
-    def __init__(self, data: Any, priority: int = 0, timestamp: Optional[float] = None):
+    __slots__ = ('data', 'priority', 'timestamp', 'seq', 'retry_count', 'max_retries', 'removed')
+    
+    # 所有队列共享的回收池：短生命周期的队列也能复用其他队列回收的项。
+    # list.pop/append 在GIL下是原子的，无需额外加锁；上限只是软限制
+    _pool: ClassVar[List['PriorityQueueItem']] = []
+    POOL_SIZE: ClassVar[int] = 8192
+    # 全局自增序号：时间戳相同（时钟分辨率不足）时按创建顺序排序，next() 在GIL下是原子的
+    _counter: ClassVar[Iterator[int]] = itertools.count()
+    
+    def __init__(self, data: Any, priority: int = 0, timestamp: Optional[int] = None):
         self.data = data
         self.priority = priority  # 优先级
-        self.timestamp = timestamp or time.time()  # 入队时间，用于相同优先级的FIFO
+        # 入队时间（单调时钟纳秒整数），用于相同优先级的FIFO，不受系统时间调整影响
+        self.timestamp = timestamp if timestamp is not None else time.monotonic_ns()
+        self.seq = next(PriorityQueueItem._counter)  # 创建序号，同优先级同时间戳时保证FIFO
         self.retry_count = 0  # 重试次数
         self.max_retries = 3  # 最大重试次数
+        self.removed = False  # 已被remove/update_priority作废，出堆时跳过
     
     def __lt__(self, other: 'PriorityQueueItem') -> bool:
-        """比较函数：先比较优先级，再比较时间戳"""
-        if self.priority != other.priority:
-            return self.priority < other.priority
-        return self.timestamp < other.timestamp
+        """比较函数：依次比较优先级、时间戳和创建序号"""
+        return (self.priority, self.timestamp, self.seq) < (other.priority, other.timestamp, other.seq)
     
     def __eq__(self, other: 'PriorityQueueItem') -> bool:
         return (self.priority == other.priority and 
                 self.timestamp == other.timestamp and
                 self.data == other.data)
     
+    @classmethod
+    def acquire(cls, data: Any, priority: int = 0, timestamp: Optional[int] = None) -> 'PriorityQueueItem':
+        """从共享回收池取出项并重新初始化，池为空时新建"""
+        try:
+            item = cls._pool.pop()
+        except IndexError:
+            return cls(data, priority, timestamp)
+        item.data = data
+        item.priority = priority
+        item.timestamp = timestamp if timestamp is not None else time.monotonic_ns()
+        item.seq = next(cls._counter)
+        item.retry_count = 0
+        item.max_retries = 3
+        item.removed = False
+        return item
+    
+    @classmethod
+    def release(cls, item: 'PriorityQueueItem') -> None:
+        """将不再使用的项放回共享回收池"""
+        if len(cls._pool) < cls.POOL_SIZE:
+            item.data = None  # 不持有已出队数据的引用
+            cls._pool.append(item)
+    
     def __repr__(self) -> str:
         return f"PriorityQueueItem(data={self.data}, priority={self.priority}, retry={self.retry_count})"
 
 
+class ResourceUsage(Mapping):
+    """资源使用情况快照
+    
+    只保存四个计数值，百分比在读取时才计算；保留按键取值的字典用法。
+    """
+    
+    __slots__ = ('current_size', 'max_size', 'current_memory_mb', 'max_memory_mb')
+    
+    _KEYS = ('current_size', 'max_size', 'size_usage_percent',
+             'current_memory_mb', 'max_memory_mb', 'memory_usage_percent')
+    
+    def __init__(self, current_size: int, max_size: int, current_memory_mb: float, max_memory_mb: float):
+        self.current_size = current_size
+        self.max_size = max_size
+        self.current_memory_mb = current_memory_mb
+        self.max_memory_mb = max_memory_mb
+    
+    @property
+    def size_usage_percent(self) -> float:
+        return (self.current_size / self.max_size) * 100
+    
+    @property
+    def memory_usage_percent(self) -> float:
+        return (self.current_memory_mb / self.max_memory_mb) * 100
+    
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+    
+    def __len__(self) -> int:
+        return len(self._KEYS)
+    
+    def __repr__(self) -> str:
+        return f"ResourceUsage({dict(self)})"
+
+
 class ResourceController:
-    """资源控制器，管理队列资源使用"""
+    """资源控制器，管理队列资源使用
+    
+    自身不加锁：由持有者（如PriorityQueue）在自己的锁内调用，
+    避免每次入队/出队重复获取多把锁。
+    """
+    
+    __slots__ = ('max_size', 'max_memory_mb', 'current_size', 'current_memory_mb')
     
     def __init__(self, max_size: int = 1000, max_memory_mb: int = 100):
         self.max_size = max_size
         self.max_memory_mb = max_memory_mb
         self.current_size = 0
         self.current_memory_mb = 0
-        self._lock = Lock()
     
     def can_add_item(self, item_size_mb: float = 0.1) -> bool:
         """检查是否可以添加新项"""
-        with self._lock:
-            if self.current_size >= self.max_size:
-                return False
-            if self.current_memory_mb + item_size_mb > self.max_memory_mb:
-                return False
-            return True
+        if self.current_size >= self.max_size:
+            return False
+        if self.current_memory_mb + item_size_mb > self.max_memory_mb:
+            return False
+        return True
+    
+    def try_add_item(self, item_size_mb: float = 0.1) -> bool:
+        """检查并占用一项的资源（一次调用完成 can_add_item + add_item），不足时不做修改"""
+        size = self.current_size
+        memory = self.current_memory_mb + item_size_mb
+        if size >= self.max_size or memory > self.max_memory_mb:
+            return False
+        self.current_size = size + 1
+        self.current_memory_mb = memory
+        return True
     
     def add_item(self, item_size_mb: float = 0.1):
         """添加项时更新资源计数"""
-        with self._lock:
-            self.current_size += 1
-            self.current_memory_mb += item_size_mb
+        self.current_size += 1
+        self.current_memory_mb += item_size_mb
     
     def remove_item(self, item_size_mb: float = 0.1):
         """移除项时更新资源计数"""
-        with self._lock:
-            self.current_size = max(0, self.current_size - 1)
-            self.current_memory_mb = max(0.0, self.current_memory_mb - item_size_mb)
-            return True
+        self.current_size = max(0, self.current_size - 1)
+        self.current_memory_mb = max(0.0, self.current_memory_mb - item_size_mb)
+        return True
+    
+    def add_items(self, count: int, total_size_mb: float):
+        """批量添加项时一次性更新资源计数"""
+        self.current_size += count
+        self.current_memory_mb += total_size_mb
+    
+    def remove_items(self, count: int, total_size_mb: Optional[float] = None):
+        """批量移除项时一次性更新资源计数，total_size_mb 默认按每项0.1MB计算"""
+        if total_size_mb is None:
+            total_size_mb = 0.1 * count
+        self.current_size = max(0, self.current_size - count)
+        self.current_memory_mb = max(0.0, self.current_memory_mb - total_size_mb)
+        return True
     
-    def get_resource_usage(self) -> dict:
-        """获取资源使用情况"""
-        with self._lock:
-            return {
-                'current_size': self.current_size,
-                'max_size': self.max_size,
-                'size_usage_percent': (self.current_size / self.max_size) * 100,
-                'current_memory_mb': self.current_memory_mb,
-                'max_memory_mb': self.max_memory_mb,
-                'memory_usage_percent': (self.current_memory_mb / self.max_memory_mb) * 100
-            }
+    def get_resource_usage(self) -> ResourceUsage:
+        """获取资源使用情况（快照）"""
+        return ResourceUsage(self.current_size, self.max_size,
+                             self.current_memory_mb, self.max_memory_mb)
 
 
 class PriorityQueue(DataStructure):
     """线程安全的优先级队列，用于框架资源控制"""
     
-    def __init__(self, max_size: int = 1000, max_memory_mb: int = 100, name: str = ""):
+    def __init__(self, max_size: int = 1000, max_memory_mb: int = 100, name: str = "",
+                 evict_on_full: bool = False):
         self.name = name
-        self._queue: List[PriorityQueueItem] = []
+        # 队列已满时，put 以淘汰当前优先级最低的项代替拒绝（只保留优先级最高的项）
+        self.evict_on_full = evict_on_full
+        # 堆中存放 (priority, timestamp, seq, item) 元组：比较在C层按元组逐项完成，
+        # 项的全局唯一序号 seq 保证永远不会比较到item本身
+        self._queue: List[Tuple[int, int, int, PriorityQueueItem]] = []
+        # 所有项优先级相同时（常见的默认优先级场景）改用双端队列按FIFO存放，
+        # 出现不同优先级时再整体转入堆；队列取空后恢复FIFO模式
+        self._fifo: deque = deque()
+        self._fifo_mode = True
+        self._fifo_priority: Optional[int] = None
+        # 数据到堆中有效项的索引（仅可哈希数据），remove/update_priority 无需扫描和重新堆化；
+        # 同一数据可能多次入队，值为按入队顺序排列的 {id(项): 项}，移除任一项都是O(1)
+        self._entry_finder: Dict[Any, Dict[int, PriorityQueueItem]] = {}
+        self._live_count = 0  # 堆中未作废的项数
         self._lock = Lock()
+        self._not_empty = Condition(self._lock)  # 有新项入队时唤醒等待的get
+        self._waiters = 0  # 正在等待的get数，没有等待者时入队无需notify
         self._resource_controller = ResourceController(max_size, max_memory_mb)
         self._stats = {
             'total_processed': 0,
             'total_failed': 0,
             'peak_size': 0,
+            'total_evicted': 0,
             'created_at': time.time()
         }
     
@@ -99,22 +210,96 @@ class PriorityQueue(DataStructure):
             item_size_mb: 项的预估内存大小（MB）
             
         Returns:
-            bool: 是否成功添加
+            bool: 是否成功添加（启用 evict_on_full 时，若新项优先级高于队列中最低的项，
+            则淘汰该项后添加）
         """
-        if not self._resource_controller.can_add_item(item_size_mb):
-            return False
-        
         with self._lock:
-            item = PriorityQueueItem(data, priority)
-            heappush(self._queue, item)
-            self._resource_controller.add_item(item_size_mb)
+            # 资源检查与入队在同一临界区内完成，避免检查后状态被其他线程改变
+            resources = self._resource_controller
+            if not resources.try_add_item(item_size_mb):
+                if not (self.evict_on_full and self._evict_for(priority, item_size_mb)):
+                    return False
+                resources.add_item(item_size_mb)
+            
+            item = PriorityQueueItem.acquire(data, priority)
+            entry = (priority, item.timestamp, item.seq, item)
+            if self._fifo_mode and (priority == self._fifo_priority or not self._fifo):
+                self._fifo_priority = priority
+                self._fifo.append(entry)
+            else:
+                if self._fifo_mode:
+                    self._promote_to_heap()
+                heappush(self._queue, entry)
+            self._track(item)
+            self._live_count += 1
+            if self._waiters:
+                self._not_empty.notify()
             
             # 更新统计
-            current_size = len(self._queue)
-            self._stats['peak_size'] = max(self._stats['peak_size'], current_size)
+            if self._live_count > self._stats['peak_size']:
+                self._stats['peak_size'] = self._live_count
             
         return True
     
+    def put_many(self, items: Iterable[Tuple[Any, ...]]) -> bool:
+        """
+        批量添加项到队列（一次加锁，一次堆化）
+        
+        Args:
+            items: (data, priority) 或 (data, priority, item_size_mb) 元组的可迭代对象
+            
+        Returns:
+            bool: 是否成功添加（资源不足时一项都不添加）
+        """
+        new_items = []
+        total_size_mb = 0.0
+        for entry in items:
+            item_size_mb = entry[2] if len(entry) > 2 else 0.1
+            new_items.append(PriorityQueueItem.acquire(entry[0], entry[1]))
+            total_size_mb += item_size_mb
+        
+        if not new_items:
+            return True
+        
+        with self._lock:
+            resources = self._resource_controller
+            if (resources.current_size + len(new_items) > resources.max_size or
+                    resources.current_memory_mb + total_size_mb > resources.max_memory_mb):
+                for item in new_items:
+                    PriorityQueueItem.release(item)
+                return False
+            
+            entries = [(item.priority, item.timestamp, item.seq, item) for item in new_items]
+            priority = entries[0][0] if not self._fifo else self._fifo_priority
+            if self._fifo_mode and all(entry[0] == priority for entry in entries):
+                self._fifo_priority = priority
+                self._fifo.extend(entries)
+            else:
+                if self._fifo_mode:
+                    self._promote_to_heap()
+                self._queue.extend(entries)
+                heapify(self._queue)
+            for item in new_items:
+                self._track(item)
+            self._live_count += len(new_items)
+            resources.add_items(len(new_items), total_size_mb)
+            if self._waiters:
+                self._not_empty.notify(len(new_items))
+            
+            # 更新统计
+            if self._live_count > self._stats['peak_size']:
+                self._stats['peak_size'] = self._live_count
+        
+        return True
+    
+    @classmethod
+    def from_iterable(cls, items: Iterable[Tuple[Any, ...]], **kwargs) -> 'PriorityQueue':
+        """从可迭代对象批量构建队列，kwargs 传给构造函数"""
+        queue = cls(**kwargs)
+        if not queue.put_many(items):
+            raise ValueError("初始项超出队列资源限制")
+        return queue
+    
     def get(self, timeout: Optional[float] = None) -> Optional[Any]:
         """
         从队列获取优先级最高的项
@@ -125,57 +310,265 @@ class PriorityQueue(DataStructure):
         Returns:
             数据或None（如果队列为空或超时）
         """
-        if timeout is not None:
-            start_time = time.time()
-            while len(self._queue) == 0:
-                if time.time() - start_time >= timeout:
-                    return None
-                time.sleep(0.01)
-        
         with self._lock:
-            if not self._queue:
+            if timeout is not None and not self._live_count:
+                deadline = time.monotonic() + timeout
+                while not self._live_count:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return None
+                    self._waiters += 1
+                    try:
+                        self._not_empty.wait(remaining)
+                    finally:
+                        self._waiters -= 1
+            
+            if not self._live_count:
                 return None
             
-            item = heappop(self._queue)
             self._resource_controller.remove_item()
             self._stats['total_processed'] += 1
+            return self._pop_data()
+    
+    def get_many(self, max_items: Optional[int] = None, timeout: Optional[float] = None) -> List[Any]:
+        """
+        批量获取优先级最高的若干项（一次加锁），适合单个消费者批量处理
+        
+        Args:
+            max_items: 最多获取的项数，None表示取出全部
+            timeout: 队列为空时的等待时间（秒），None表示不等待
+            
+        Returns:
+            按优先级顺序排列的数据列表（队列为空或超时返回空列表）
+        """
+        with self._lock:
+            if timeout is not None and not self._live_count:
+                deadline = time.monotonic() + timeout
+                while not self._live_count:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return []
+                    self._waiters += 1
+                    try:
+                        self._not_empty.wait(remaining)
+                    finally:
+                        self._waiters -= 1
             
-            return item.data
+            count = self._live_count if max_items is None else min(max_items, self._live_count)
+            if count <= 0:
+                return []
+            
+            result = [self._pop_data() for _ in range(count)]
+            self._resource_controller.remove_items(count)
+            self._stats['total_processed'] += count
+            return result
     
     def peek(self) -> Optional[Any]:
         """查看优先级最高的项（不移除）"""
         with self._lock:
-            if not self._queue:
+            if not self._live_count:
                 return None
-            return self._queue[0].data
+            self._discard_removed_top()
+            return self._entries()[0][3].data
     
     def remove(self, data: Any) -> bool:
         """移除指定的数据项"""
         with self._lock:
-            for i, item in enumerate(self._queue):
-                if item.data == data:
-                    # 从堆中移除指定项
-                    self._queue[i] = self._queue[-1]  # 用最后一项替换
-                    self._queue.pop()  # 移除最后一项
-                    heapify(self._queue)  # 重新堆化
-                    self._resource_controller.remove_item()
-                    return True
-            return False
+            item = self._find(data)
+            if item is None:
+                return False
+            self._invalidate(item)
+            self._resource_controller.remove_item()
+            return True
     
     def update_priority(self, data: Any, new_priority: int) -> bool:
         """更新指定数据的优先级"""
         with self._lock:
-            for item in self._queue:
-                if item.data == data:
-                    item.priority = new_priority
-                    heapify(self._queue)  # 重新堆化
-                    return True
+            item = self._find(data)
+            if item is None:
+                return False
+            # 作废旧项并以新优先级重新入堆，保留原入队时间以维持同优先级FIFO；
+            # 旧项作废后可能立即被回收复用，需先取出其字段
+            timestamp, retry_count, max_retries = item.timestamp, item.retry_count, item.max_retries
+            self._invalidate(item)
+            if self._fifo_mode:
+                # 保留原入队时间的新项不一定排在队尾，改用堆存放
+                self._promote_to_heap()
+            new_item = PriorityQueueItem.acquire(data, new_priority, timestamp)
+            new_item.retry_count = retry_count
+            new_item.max_retries = max_retries
+            heappush(self._queue, (new_priority, new_item.timestamp, new_item.seq, new_item))
+            self._track(new_item)
+            self._live_count += 1
+            return True
+    
+    def _pop_data(self) -> Any:
+        """弹出优先级最高的有效项并返回其数据，资源计数由调用方更新（调用方需持有锁且队列非空）"""
+        if self._fifo_mode:
+            fifo = self._fifo
+            item = fifo.popleft()[3]
+            while item.removed:
+                PriorityQueueItem.release(item)
+                item = fifo.popleft()[3]
+        else:
+            queue = self._queue
+            item = heappop(queue)[3]
+            while item.removed:
+                PriorityQueueItem.release(item)
+                item = heappop(queue)[3]
+        self._untrack(item)
+        self._live_count -= 1
+        if not self._live_count and not self._fifo_mode:
+            self._reset_storage()
+        
+        data = item.data
+        PriorityQueueItem.release(item)
+        return data
+    
+    def _track(self, item: PriorityQueueItem) -> None:
+        """将项加入数据索引（调用方需持有锁）"""
+        data = item.data
+        if type(data).__hash__ is None:
+            return
+        try:
+            items = self._entry_finder.get(data)
+        except TypeError:
+            # 含不可哈希成员的元组等，不建索引
+            return
+        if items is None:
+            self._entry_finder[data] = {id(item): item}
+        else:
+            items[id(item)] = item
+    
+    def _untrack(self, item: PriorityQueueItem) -> None:
+        """将项移出数据索引（调用方需持有锁）"""
+        data = item.data
+        if type(data).__hash__ is None:
+            return
+        try:
+            items = self._entry_finder.get(data)
+        except TypeError:
+            return
+        if items is None:
+            return
+        items.pop(id(item), None)
+        if not items:
+            del self._entry_finder[data]
+    
+    def _find(self, data: Any) -> Optional[PriorityQueueItem]:
+        """查找数据对应的有效项（调用方需持有锁）"""
+        if type(data).__hash__ is not None:
+            try:
+                items = self._entry_finder.get(data)
+            except TypeError:
+                items = None
+            else:
+                # 多个相同数据时返回最早入队的项
+                return next(iter(items.values())) if items else None
+        # 不可哈希的数据回退到线性查找，先比较身份（与list/dict的成员判断一致），相同对象无需调用__eq__
+        for entry in self._entries():
+            item = entry[3]
+            if not item.removed and (item.data is data or item.data == data):
+                return item
+        return None
+    
+    def _evict_for(self, priority: int, item_size_mb: float) -> bool:
+        """淘汰优先级最低的一项为新项腾出空间（调用方需持有锁）
+        
+        只有最低的项优先级严格低于新项、且淘汰一项后足以容纳新项时才淘汰，否则不做任何修改。
+        """
+        resources = self._resource_controller
+        if (resources.current_size - 1 >= resources.max_size or
+                resources.current_memory_mb - 0.1 + item_size_mb > resources.max_memory_mb):
             return False
+        entries = self._entries()
+        index = self._worst_index()
+        if index is None or entries[index][0] <= priority:
+            return False
+        # 被淘汰的是优先级最低的项，永远不会到达堆顶，必须真正移出存储而不是只作废
+        if self._fifo_mode:
+            worst = entries.pop()[3]
+        else:
+            worst = entries[index][3]
+            last = entries.pop()
+            if index < len(entries):
+                entries[index] = last
+                heapify(entries)
+        self._untrack(worst)
+        self._live_count -= 1
+        PriorityQueueItem.release(worst)
+        resources.remove_item()
+        self._stats['total_evicted'] += 1
+        return True
+    
+    def _worst_index(self) -> Optional[int]:
+        """获取最后出队的有效项在存储中的下标（调用方需持有锁）"""
+        if self._fifo_mode:
+            # FIFO中最后入队的即最后出队，先回收队尾已作废的项
+            fifo = self._fifo
+            while fifo and fifo[-1][3].removed:
+                PriorityQueueItem.release(fifo.pop()[3])
+            return len(fifo) - 1 if fifo else None
+        # 堆只保证堆顶有序，淘汰时线性查找最大的有效项（只在队列已满时发生）
+        queue = self._queue
+        return max((index for index, entry in enumerate(queue) if not entry[3].removed),
+                   key=queue.__getitem__, default=None)
+    
+    def _invalidate(self, item: PriorityQueueItem) -> None:
+        """作废堆中的项，实际出堆延迟到其到达堆顶时（调用方需持有锁）"""
+        item.removed = True
+        self._untrack(item)
+        self._live_count -= 1
+        self._discard_removed_top()
+        # 不在堆顶的作废项不会被出堆，多于有效项时重建存储，避免无限堆积（均摊O(1)）
+        if len(self._entries()) > 2 * self._live_count:
+            self._compact()
+    
+    def _compact(self) -> None:
+        """丢弃全部作废项并重建存储（调用方需持有锁）"""
+        entries = self._entries()
+        # 作废项数量可能很大，直接丢弃交给GC，不逐个放回回收池
+        live = [entry for entry in entries if not entry[3].removed]
+        entries.clear()
+        entries.extend(live)
+        if not self._fifo_mode:
+            # FIFO保持原有顺序；堆中剩余项需重新堆化
+            heapify(entries)
+    
+    def _discard_removed_top(self) -> None:
+        """弹出堆顶已作废的项（调用方需持有锁）"""
+        if self._fifo_mode:
+            fifo = self._fifo
+            while fifo and fifo[0][3].removed:
+                PriorityQueueItem.release(fifo.popleft()[3])
+        else:
+            queue = self._queue
+            while queue and queue[0][3].removed:
+                PriorityQueueItem.release(heappop(queue)[3])
+    
+    def _entries(self):
+        """当前使用的存储（调用方需持有锁）"""
+        return self._fifo if self._fifo_mode else self._queue
+    
+    def _promote_to_heap(self) -> None:
+        """将FIFO中的项转入堆（调用方需持有锁）"""
+        self._queue.extend(self._fifo)
+        heapify(self._queue)
+        self._fifo.clear()
+        self._fifo_mode = False
+    
+    def _reset_storage(self) -> None:
+        """回收全部项并恢复FIFO模式（调用方需持有锁）"""
+        for entry in self._entries():
+            PriorityQueueItem.release(entry[3])
+        self._queue.clear()
+        self._fifo.clear()
+        self._fifo_mode = True
+        self._fifo_priority = None
     
     def qsize(self) -> int:
-        """获取队列大小"""
-        with self._lock:
-            return len(self._queue)
+        """获取队列大小（读取单个整数计数，无需加锁）"""
+        return self._live_count
     
     def empty(self) -> bool:
         """检查队列是否为空"""
@@ -184,37 +577,242 @@ class PriorityQueue(DataStructure):
     def clear(self):
         """清空队列"""
         with self._lock:
-            self._queue.clear()
+            self._reset_storage()
+            self._entry_finder.clear()
+            self._live_count = 0
             # 重置资源计数
             self._resource_controller.current_size = 0
             self._resource_controller.current_memory_mb = 0
     
     def get_stats(self) -> dict:
-        """获取队列统计信息"""
+        """获取队列统计信息
+        
+        不获取队列锁：各计数单独读取都是原子的，监控频繁轮询时不会阻塞入队/出队，
+        代价是各项之间可能相差正在进行的一次操作。
+        """
+        stats = self._stats
+        return {
+            'total_processed': stats['total_processed'],
+            'total_failed': stats['total_failed'],
+            'peak_size': stats['peak_size'],
+            'total_evicted': stats['total_evicted'],
+            'created_at': stats['created_at'],
+            'name': self.name,
+            'current_size': self._live_count,
+            'resource_usage': self._resource_controller.get_resource_usage(),
+            'uptime_seconds': time.time() - stats['created_at']
+        }
+    
+    def _snapshot(self) -> List[Tuple[int, int, int, Any]]:
+        """有效项的 (priority, timestamp, seq, data) 快照，按出队顺序排列（调用方需持有锁）
+        
+        元组比较到seq即可分出先后，不会比较数据；FIFO模式下快照本身已有序，排序只需一次线性扫描。
+        """
+        return sorted([(entry[0], entry[1], entry[2], entry[3].data)
+                       for entry in self._entries() if not entry[3].removed])
+    
+    def get_all_items(self) -> List[Tuple[Any, int]]:
+        """获取所有项的数据和优先级，按出队顺序排列（用于调试）"""
+        with self._lock:
+            return [(entry[3], entry[0]) for entry in self._snapshot()]
+    
+    def __iter__(self) -> Iterator[Any]:
+        """迭代器，按优先级顺序（同优先级按入队顺序）"""
+        # 在锁内取出有效项的有序快照，迭代期间不持有锁
         with self._lock:
-            stats = self._stats.copy()
-            stats.update({
-                'name': self.name,
-                'current_size': len(self._queue),
-                'resource_usage': self._resource_controller.get_resource_usage(),
-                'uptime_seconds': time.time() - self._stats['created_at']
-            })
-            return stats
+            snapshot = self._snapshot()
+        for entry in snapshot:
+            yield entry[3]
+    
+    def __len__(self) -> int:
+        return self.qsize()
+    
+    def __repr__(self) -> str:
+        return f"PriorityQueue(name='{self.name}', size={self.qsize()})"
+
+class BucketPriorityQueue(DataStructure):
+    """小整数优先级的桶式优先级队列
+    
+    优先级限定为 [0, max_priority) 的整数，每个优先级一个FIFO双端队列，
+    用位掩码记录非空的桶：取最高优先级只需一次位运算，不做任何比较和堆调整。
+    接口与 PriorityQueue 的常用部分一致（不支持 update_priority）。
+    """
+    
+    def __init__(self, max_priority: int = 64, max_size: int = 1000, max_memory_mb: int = 100, name: str = ""):
+        if max_priority <= 0:
+            raise ValueError("max_priority 必须为正整数")
+        self.name = name
+        self.max_priority = max_priority
+        self._buckets: List[deque] = [deque() for _ in range(max_priority)]
+        self._mask = 0  # 第p位为1表示优先级p的桶非空
+        self._size = 0
+        self._lock = Lock()
+        self._not_empty = Condition(self._lock)  # 有新项入队时唤醒等待的get
+        self._waiters = 0  # 正在等待的get数，没有等待者时入队无需notify
+        self._resource_controller = ResourceController(max_size, max_memory_mb)
+        self._stats = {
+            'total_processed': 0,
+            'total_failed': 0,
+            'peak_size': 0,
+            'created_at': time.time()
+        }
+    
+    def put(self, data: Any, priority: int = 0, item_size_mb: float = 0.1) -> bool:
+        """
+        添加项到队列
+        
+        Args:
+            data: 要存储的数据
+            priority: 优先级，0 到 max_priority-1 的整数，数字越小优先级越高（默认0）
+            item_size_mb: 项的预估内存大小（MB）
+            
+        Returns:
+            bool: 是否成功添加
+        """
+        if not 0 <= priority < self.max_priority:
+            raise ValueError(f"优先级 {priority} 超出范围 [0, {self.max_priority})")
+        
+        with self._lock:
+            if not self._resource_controller.try_add_item(item_size_mb):
+                return False
+            
+            self._buckets[priority].append(data)
+            self._mask |= 1 << priority
+            self._size += 1
+            if self._waiters:
+                self._not_empty.notify()
+            
+            if self._size > self._stats['peak_size']:
+                self._stats['peak_size'] = self._size
+        
+        return True
+    
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        从队列获取优先级最高的项
+        
+        Args:
+            timeout: 超时时间（秒），None表示不等待
+            
+        Returns:
+            数据或None（如果队列为空或超时）
+        """
+        with self._lock:
+            if timeout is not None and not self._size:
+                deadline = time.monotonic() + timeout
+                while not self._size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return None
+                    self._waiters += 1
+                    try:
+                        self._not_empty.wait(remaining)
+                    finally:
+                        self._waiters -= 1
+            
+            if not self._size:
+                return None
+            
+            self._resource_controller.remove_item()
+            self._stats['total_processed'] += 1
+            return self._pop_data()
+    
+    def get_many(self, max_items: Optional[int] = None) -> List[Any]:
+        """批量获取优先级最高的若干项（一次加锁），max_items 为 None 时取出全部"""
+        with self._lock:
+            count = self._size if max_items is None else min(max_items, self._size)
+            if count <= 0:
+                return []
+            
+            result = [self._pop_data() for _ in range(count)]
+            self._resource_controller.remove_items(count)
+            self._stats['total_processed'] += count
+            return result
+    
+    def peek(self) -> Optional[Any]:
+        """查看优先级最高的项（不移除）"""
+        with self._lock:
+            if not self._size:
+                return None
+            mask = self._mask
+            return self._buckets[(mask & -mask).bit_length() - 1][0]
+    
+    def remove(self, data: Any) -> bool:
+        """移除指定的数据项（逐桶查找）"""
+        with self._lock:
+            mask = self._mask
+            while mask:
+                priority = (mask & -mask).bit_length() - 1
+                mask &= mask - 1
+                bucket = self._buckets[priority]
+                try:
+                    bucket.remove(data)
+                except ValueError:
+                    continue
+                if not bucket:
+                    self._mask &= ~(1 << priority)
+                self._size -= 1
+                self._resource_controller.remove_item()
+                return True
+            return False
+    
+    def _pop_data(self) -> Any:
+        """弹出优先级最高的项（调用方需持有锁且队列非空）"""
+        mask = self._mask
+        # 最低的置位即最高优先级的非空桶
+        priority = (mask & -mask).bit_length() - 1
+        bucket = self._buckets[priority]
+        data = bucket.popleft()
+        if not bucket:
+            self._mask = mask & ~(1 << priority)
+        self._size -= 1
+        return data
+    
+    def qsize(self) -> int:
+        """获取队列大小（读取单个整数计数，无需加锁）"""
+        return self._size
+    
+    def empty(self) -> bool:
+        """检查队列是否为空"""
+        return self._size == 0
+    
+    def clear(self):
+        """清空队列"""
+        with self._lock:
+            for bucket in self._buckets:
+                bucket.clear()
+            self._mask = 0
+            self._size = 0
+            self._resource_controller.current_size = 0
+            self._resource_controller.current_memory_mb = 0
+    
+    def get_stats(self) -> dict:
+        """获取队列统计信息（不加锁，与 PriorityQueue.get_stats 相同）"""
+        stats = self._stats
+        return {
+            'total_processed': stats['total_processed'],
+            'total_failed': stats['total_failed'],
+            'peak_size': stats['peak_size'],
+            'created_at': stats['created_at'],
+            'name': self.name,
+            'current_size': self._size,
+            'resource_usage': self._resource_controller.get_resource_usage(),
+            'uptime_seconds': time.time() - stats['created_at']
+        }
     
     def get_all_items(self) -> List[Tuple[Any, int]]:
         """获取所有项的数据和优先级（用于调试）"""
         with self._lock:
-            return [(item.data, item.priority) for item in self._queue]
+            return [(data, priority) for priority, bucket in enumerate(self._buckets) for data in bucket]
     
     def __iter__(self) -> Iterator[Any]:
-        """迭代器，按优先级顺序"""
-        temp_queue = self.get_all_items()
-        temp_queue.sort(key=lambda x: x[1])  # 按优先级排序
-        for data, _ in temp_queue:
-            yield data
+        """迭代器，按优先级顺序（同优先级按入队顺序）"""
+        with self._lock:
+            snapshot = [data for bucket in self._buckets for data in bucket]
+        return iter(snapshot)
     
     def __len__(self) -> int:
-        return self.qsize()
+        return self._size
     
     def __repr__(self) -> str:
-        return f"PriorityQueue(name='{self.name}', size={self.qsize()})"
\ No newline at end of file
+        return f"BucketPriorityQueue(name='{self.name}', size={self._size})"
@@ -0,0 +1,107 @@
+from typing import Any, Optional, Iterator
+from collections import deque
+from threading import Lock, Condition
+import time
+from .data_structure import DataStructure
+
+class SPSCQueue(DataStructure):
+    """单生产者/单消费者的FIFO队列
+    
+    数据存放在 collections.deque 中，append/popleft 在GIL下是原子操作，
+    入队和非阻塞出队都不加锁；只有get需要等待时才进入条件变量。
+    适合所有项优先级相同、一个线程写一个线程读的场景，多生产者时容量上限可能被略微超出。
+    """
+    
+    def __init__(self, max_size: int = 1000, name: str = ""):
+        if max_size <= 0:
+            raise ValueError("max_size 必须为正整数")
+        self.name = name
+        self.max_size = max_size
+        self._items: deque = deque()
+        self._not_empty = Condition(Lock())  # 仅在消费者等待时使用
+        self._waiters = 0  # 正在等待的get数，没有等待者时入队无需notify
+    
+    def put(self, data: Any) -> bool:
+        """
+        添加项到队列尾部
+        
+        Args:
+            data: 要存储的数据
+        
+        Returns:
+            bool: 是否成功添加（队列已满时返回False）
+        """
+        if len(self._items) >= self.max_size:
+            return False
+        
+        self._items.append(data)
+        if self._waiters:
+            with self._not_empty:
+                self._not_empty.notify()
+        return True
+    
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        从队列头部获取项
+        
+        Args:
+            timeout: 超时时间（秒），None表示不等待
+        
+        Returns:
+            数据或None（如果队列为空或超时）
+        """
+        try:
+            return self._items.popleft()
+        except IndexError:
+            if timeout is None:
+                return None
+        
+        deadline = time.monotonic() + timeout
+        with self._not_empty:
+            # 先登记等待再重取：之后入队的生产者一定能看到等待者并notify
+            self._waiters += 1
+            try:
+                while True:
+                    try:
+                        return self._items.popleft()
+                    except IndexError:
+                        pass
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return None
+                    self._not_empty.wait(remaining)
+            finally:
+                self._waiters -= 1
+    
+    def peek(self) -> Optional[Any]:
+        """查看队列头部的项（不移除）"""
+        try:
+            return self._items[0]
+        except IndexError:
+            return None
+    
+    def qsize(self) -> int:
+        """获取队列大小"""
+        return len(self._items)
+    
+    def empty(self) -> bool:
+        """检查队列是否为空"""
+        return not self._items
+    
+    def full(self) -> bool:
+        """检查队列是否已满"""
+        return len(self._items) >= self.max_size
+    
+    def clear(self):
+        """清空队列"""
+        self._items.clear()
+    
+    def __iter__(self) -> Iterator[Any]:
+        """按出队顺序迭代队列中的数据（快照）"""
+        return iter(list(self._items))
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def __repr__(self) -> str:
+        return f"SPSCQueue(name='{self.name}', size={len(self._items)}, max_size={self.max_size})"
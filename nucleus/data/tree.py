@@ -2,13 +2,35 @@
 决策树模块 - 用于命令和事件处理的决策逻辑
 """
 
-from typing import Any, Dict, Optional, Callable, List
+from typing import Any, Dict, Optional, Callable, List, Tuple
 import asyncio
+import inspect
+
+
+# asyncio 给 AsyncMock 等对象设置的协程标记（私有对象，新版本中可能被移除）
+_COROUTINE_MARKER = getattr(asyncio.coroutines, '_is_coroutine', None)
+
+
+def _is_coroutine_function(func: Callable) -> bool:
+    """判断是否为协程函数
+    
+    直接使用 inspect 检查代码对象标志，并兼容带 asyncio 协程标记的对象（如 AsyncMock），
+    避免 asyncio.iscoroutinefunction 的额外开销及其在新版本中的弃用警告。
+    标记按身份比较：MagicMock 访问任意属性都会得到新的Mock，不能只判断属性是否存在。
+    """
+    if inspect.iscoroutinefunction(func):
+        return True
+    return _COROUTINE_MARKER is not None and getattr(func, '_is_coroutine', None) is _COROUTINE_MARKER
 
 
 class TreeNode:
     """决策树节点"""
     
+    __slots__ = ('name', '_condition', '_action', 'children', '_cond_is_coro', '_action_is_coro')
+    
+    # 任一节点的条件/动作被重新赋值时递增，Tree据此判断缓存的结构信息是否失效
+    _version = 0
+    
     def __init__(self, name: str, condition: Optional[Callable] = None, 
                  action: Optional[Callable] = None, children: Optional[List['TreeNode']] = None):
         self.name = name
@@ -16,33 +38,85 @@ class TreeNode:
         self.action = action
         self.children = children or []
     
+    @property
+    def condition(self) -> Optional[Callable]:
+        return self._condition
+    
+    @condition.setter
+    def condition(self, condition: Optional[Callable]) -> None:
+        # 是否为协程函数在赋值时确定一次，评估时无需重复检查
+        self._condition = condition
+        self._cond_is_coro = condition is not None and _is_coroutine_function(condition)
+        TreeNode._version += 1
+    
+    @property
+    def action(self) -> Optional[Callable]:
+        return self._action
+    
+    @action.setter
+    def action(self, action: Optional[Callable]) -> None:
+        self._action = action
+        self._action_is_coro = action is not None and _is_coroutine_function(action)
+        TreeNode._version += 1
+    
     async def evaluate(self, context: Dict[str, Any]) -> Any:
-        """评估节点"""
-        # 检查条件
-        if self.condition:
-            if asyncio.iscoroutinefunction(self.condition):
-                condition_result = await self.condition(context)
-            else:
-                condition_result = self.condition(context)
-            
-            if not condition_result:
-                return None
+        """评估节点
         
-        # 执行动作
-        if self.action:
-            if asyncio.iscoroutinefunction(self.action):
-                result = await self.action(context)
-            else:
-                result = self.action(context)
+        以显式栈做先序遍历：条件不满足则跳过该子树，返回第一个非None的动作结果。
+        整棵子树只用一个协程，仅在条件/动作本身是协程函数时才await。
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            
+            # 检查条件
+            condition = node._condition
+            if condition:
+                if node._cond_is_coro:
+                    condition_result = await condition(context)
+                else:
+                    condition_result = condition(context)
+                
+                if not condition_result:
+                    continue
+            
+            # 执行动作
+            action = node._action
+            if action:
+                if node._action_is_coro:
+                    result = await action(context)
+                else:
+                    result = action(context)
+                
+                if result is not None:
+                    return result
             
-            if result is not None:
-                return result
+            # 子节点按顺序评估（逆序入栈）
+            if node.children:
+                stack.extend(reversed(node.children))
         
-        # 评估子节点
-        for child in self.children:
-            result = await child.evaluate(context)
-            if result is not None:
-                return result
+        return None
+    
+    def evaluate_sync(self, context: Dict[str, Any]) -> Any:
+        """同步评估节点，适用于条件和动作都是同步函数的树"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node._cond_is_coro or node._action_is_coro:
+                raise TypeError(f"节点 '{node.name}' 包含异步条件或动作，请使用 evaluate")
+            
+            condition = node._condition
+            if condition and not condition(context):
+                continue
+            
+            action = node._action
+            if action:
+                result = action(context)
+                if result is not None:
+                    return result
+            
+            if node.children:
+                stack.extend(reversed(node.children))
         
         return None
 
@@ -54,6 +128,11 @@ class Tree:
         self.name = name
         self.root = TreeNode("root")
         self._nodes: Dict[str, TreeNode] = {"root": self.root}
+        # 节点名 -> 父节点名，移除节点时O(1)定位父节点
+        self._parent: Dict[str, str] = {}
+        # get_structure 的缓存，add_node/remove_node/clear 或节点条件/动作变化后重建
+        self._structure_cache: Optional[Dict[str, Any]] = None
+        self._structure_version = -1
     
     def add_node(self, name: str, parent: str = "root", 
                  condition: Optional[Callable] = None,
@@ -64,6 +143,8 @@ class Tree:
         
         node = TreeNode(name, condition, action)
         self._nodes[name] = node
+        self._parent[name] = parent
+        self._structure_cache = None
         self._nodes[parent].children.append(node)
         return node
     
@@ -79,45 +160,74 @@ class Tree:
         if name not in self._nodes:
             return False
         
-        # 从父节点的子节点列表中移除
-        for node in self._nodes.values():
-            if name in [child.name for child in node.children]:
-                node.children = [child for child in node.children if child.name != name]
-                break
+        self._structure_cache = None
         
-        # 递归移除所有子节点
+        # 从父节点的子节点列表中移除
         node_to_remove = self._nodes[name]
-        for child in node_to_remove.children:
-            self.remove_node(child.name)
+        parent_node = self._nodes.get(self._parent.get(name, ""))
+        if parent_node is not None:
+            parent_node.children = [child for child in parent_node.children if child.name != name]
+        
+        # 广度优先收集所有后代节点，一次性移除
+        to_remove = [node_to_remove]
+        for node in to_remove:
+            to_remove.extend(node.children)
         
-        del self._nodes[name]
+        for node in to_remove:
+            self._nodes.pop(node.name, None)
+            self._parent.pop(node.name, None)
         return True
     
     async def evaluate(self, context: Dict[str, Any]) -> Any:
         """评估整个树"""
         return await self.root.evaluate(context)
     
+    def evaluate_sync(self, context: Dict[str, Any]) -> Any:
+        """同步评估整个树（树中不能包含异步条件或动作）"""
+        return self.root.evaluate_sync(context)
+    
     def clear(self):
         """清空树（保留根节点）"""
         self.root.children.clear()
         # 只保留根节点
         self._nodes = {"root": self.root}
+        self._parent = {}
+        self._structure_cache = None
     
     def get_structure(self) -> Dict[str, Any]:
-        """获取树的结构信息"""
-        def _get_node_structure(node: TreeNode) -> Dict[str, Any]:
+        """获取树的结构信息
+        
+        结果会被缓存并在树结构变化后重建，调用方不应修改返回的字典。
+        """
+        if self._structure_cache is not None and self._structure_version == TreeNode._version:
+            return self._structure_cache
+        
+        def _node_entry(node: TreeNode) -> Dict[str, Any]:
             return {
                 "name": node.name,
-                "has_condition": node.condition is not None,
-                "has_action": node.action is not None,
-                "children": [_get_node_structure(child) for child in node.children]
+                "has_condition": node._condition is not None,
+                "has_action": node._action is not None,
+                "children": [None] * len(node.children)
             }
         
-        return {
+        # 显式栈遍历，子节点结构直接填入预分配的列表
+        root_entry = _node_entry(self.root)
+        stack = [(self.root, root_entry)]
+        while stack:
+            node, entry = stack.pop()
+            children = entry["children"]
+            for i, child in enumerate(node.children):
+                child_entry = _node_entry(child)
+                children[i] = child_entry
+                stack.append((child, child_entry))
+        
+        self._structure_cache = {
             "name": self.name,
             "total_nodes": len(self._nodes),
-            "structure": _get_node_structure(self.root)
+            "structure": root_entry
         }
+        self._structure_version = TreeNode._version
+        return self._structure_cache
     
     def __repr__(self) -> str:
         return f"Tree(name='{self.name}', nodes={len(self._nodes)})"
@@ -157,10 +267,77 @@ def event_action(context: Dict[str, Any]) -> str:
     return f"事件 '{event_name}' 处理完成"
 
 
+class FastTree(Tree):
+    """默认决策树的特化版本
+    
+    树保持 create_default_tree 构建的形状时，直接按上下文分派到对应动作，
+    不再逐个调用条件函数和遍历子节点；结构或节点的条件/动作被修改后自动退回通用评估。
+    """
+    
+    def __init__(self, name: str = "default"):
+        super().__init__(name)
+        self._specialized = False
+        self._default_nodes: Tuple[TreeNode, ...] = ()
+    
+    def _specialize(self) -> None:
+        """记录默认形状，启用快速分派"""
+        self._default_nodes = tuple(self.root.children)
+        self._specialized = True
+    
+    def _is_default_shape(self) -> bool:
+        """检查树是否仍为默认形状"""
+        if not self._specialized:
+            return False
+        children = self.root.children
+        if len(children) != 3:
+            return False
+        command_node, event_node, default_node = self._default_nodes
+        return (
+            children[0] is command_node and children[1] is event_node and children[2] is default_node
+            and self.root._condition is None and self.root._action is None
+            and command_node._condition is has_command and command_node._action is command_action
+            and event_node._condition is has_event and event_node._action is event_action
+            and default_node._condition is always_true and default_node._action is default_action
+            and not (command_node.children or event_node.children or default_node.children)
+        )
+    
+    def _dispatch(self, context: Dict[str, Any]) -> Any:
+        """按上下文直接分派"""
+        if context.get('command'):
+            return command_action(context)
+        if context.get('event_name'):
+            return event_action(context)
+        return default_action(context)
+    
+    def add_node(self, name: str, parent: str = "root", 
+                 condition: Optional[Callable] = None,
+                 action: Optional[Callable] = None) -> TreeNode:
+        self._specialized = False
+        return super().add_node(name, parent, condition, action)
+    
+    def remove_node(self, name: str) -> bool:
+        self._specialized = False
+        return super().remove_node(name)
+    
+    def clear(self):
+        self._specialized = False
+        super().clear()
+    
+    async def evaluate(self, context: Dict[str, Any]) -> Any:
+        if self._is_default_shape():
+            return self._dispatch(context)
+        return await super().evaluate(context)
+    
+    def evaluate_sync(self, context: Dict[str, Any]) -> Any:
+        if self._is_default_shape():
+            return self._dispatch(context)
+        return super().evaluate_sync(context)
+
+
 
 def create_default_tree() -> Tree:
     """创建决策树"""
-    tree = Tree("default")
+    tree = FastTree("default")
     
     # 添加命令处理分支
     tree.add_node("command_handler", "root", has_command, command_action)
@@ -171,4 +348,5 @@ def create_default_tree() -> Tree:
     # 添加默认处理分支
     tree.add_node("default_handler", "root", always_true, default_action)
     
+    tree._specialize()
     return tree
\ No newline at end of file
@@ -1,8 +1,11 @@
 import re
+import sys
 import time
 import asyncio
-import threading
-from dataclasses import dataclass
+import functools
+import itertools
+from heapq import heapify, heappop, heappush
+from dataclasses import dataclass, field
 from typing import Callable, Awaitable, Union, Dict, Any, Tuple, TypeAlias,Optional, List
 
 from .Myclass import ClassNucleus
@@ -12,31 +15,119 @@ from .data.priority_queue import PriorityQueue, ResourceController
 Context: TypeAlias = Dict[str, Any]
 Condition: TypeAlias = Callable[[Context], bool | Awaitable[bool]]
 Action: TypeAlias = Union["DecisionNode", Callable[[Context], Any | Awaitable[Any]]]
+# 命令索引项：(处理器类, execute, execute是否为协程函数, arg_parser)
+_CommandEntry: TypeAlias = Tuple[type, Callable, bool, Optional[Callable]]
 
-# 判断是否为异步函数并包裹
+# Python 3.12+ 支持eager任务：协程在创建任务时立即同步执行到第一次挂起，
+# 未挂起就完成的处理器（如冷却中直接返回的命令）无需再经过事件循环调度
+_EAGER_START = sys.version_info >= (3, 12)
+
+def _create_task(coro: Awaitable[Any]) -> asyncio.Task:
+    """创建处理任务，支持时以eager方式启动（只影响调度器自己的任务，不修改事件循环的任务工厂）"""
+    if _EAGER_START:
+        return asyncio.Task(coro, loop=asyncio.get_running_loop(), eager_start=True)
+    return asyncio.create_task(coro)
+
+def enable_uvloop() -> bool:
+    """使用uvloop作为事件循环（可选依赖，需 pip install decorator-framework[uvloop]）
+
+    需在创建事件循环（如 asyncio.run）之前调用；调度器代码无需改动。
+
+    Returns:
+        bool: 是否成功启用（未安装uvloop时返回False，继续使用默认事件循环）
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+async def _wait_event(event: asyncio.Event, timeout: float) -> None:
+    """等待事件被设置，超时也返回（兜底轮询，兼容绕过调度器直接向队列放入数据的生产者）"""
+    try:
+        await asyncio.wait_for(event.wait(), timeout)
+    except asyncio.TimeoutError:
+        pass
+
+# 正则中的反向引用及条件分组：合并成一个表达式后分组编号会错位，不能合并
+_BACKREF_RE = re.compile(r"\\\d|\(\?P=|\(\?\(")
+
+def _format_id(id_value: Any) -> str:
+    """将 (名称, 序号) 形式的ID格式化为字符串，只在需要展示时调用"""
+    if isinstance(id_value, tuple):
+        return f"{id_value[0]}_{id_value[1]}"
+    return str(id_value)
+
+# 判断是否为异步函数并包裹（协程函数原样返回，只为同步函数创建包装）
 def maybe_async(func: Callable[[Context], Any]) -> Callable[[Context], Awaitable[Any]]:
+    if asyncio.iscoroutinefunction(func):
+        return func
     async def wrapper(ctx: Context):
-        if asyncio.iscoroutinefunction(func):
-            return await func(ctx)
         return func(ctx)
     return wrapper
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DecisionNode:
     condition: Condition
     if_true: Action
     if_false: Action | None = None
+    # 使用 __slots__，节点不带 __dict__；节点不可变（可哈希），以下标志由 __post_init__ 填充
+    _condition_is_async: bool = field(init=False, repr=False, compare=False)
+    _if_true_is_async: bool = field(init=False, repr=False, compare=False)
+    _if_false_is_async: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # 条件和分支是否为协程函数在构建时确定一次：评估时同步函数直接调用，
+        # 不再每次包装成协程并重复检查（节点不可变，替换条件或分支需重新创建节点）
+        object.__setattr__(self, '_condition_is_async', asyncio.iscoroutinefunction(self.condition))
+        object.__setattr__(self, '_if_true_is_async', asyncio.iscoroutinefunction(self.if_true))
+        object.__setattr__(self, '_if_false_is_async', asyncio.iscoroutinefunction(self.if_false))
 
     async def evaluate(self, context: Context) -> Any:
-        """递归评估决策逻辑树"""
-        result = await maybe_async(self.condition)(context)
-        next_node = self.if_true if result else self.if_false
-        if isinstance(next_node, DecisionNode):
-            return await next_node.evaluate(context)
-        elif callable(next_node):
-            return await maybe_async(next_node)(context)
+        """评估决策逻辑树
+        
+        沿分支循环下行，整棵树只用一个协程帧，子节点不再递归调用 evaluate。
+        """
+        node = self
+        while True:
+            result = node.condition(context)
+            if node._condition_is_async:
+                result = await result
+            if result:
+                next_node, is_async = node.if_true, node._if_true_is_async
+            else:
+                next_node, is_async = node.if_false, node._if_false_is_async
+            if not isinstance(next_node, DecisionNode):
+                break
+            node = next_node
+        if callable(next_node):
+            value = next_node(context)
+            return await value if is_async else value
         return next_node
 
+    def evaluate_sync(self, context: Context) -> Any:
+        """同步评估决策逻辑树，适用于条件和分支都是同步函数的树，全程不创建协程"""
+        node = self
+        while True:
+            if node._condition_is_async:
+                raise TypeError("决策节点包含异步条件，请使用 evaluate")
+            if node.condition(context):
+                next_node, is_async = node.if_true, node._if_true_is_async
+            else:
+                next_node, is_async = node.if_false, node._if_false_is_async
+            if not isinstance(next_node, DecisionNode):
+                break
+            node = next_node
+        if is_async:
+            raise TypeError("决策节点包含异步分支，请使用 evaluate")
+        if callable(next_node):
+            return next_node(context)
+        return next_node
+
+# 未注册事件消息缓存的最大条目数
+_MISS_CACHE_SIZE = 1024
+
 class EventDispatcher:
     """事件调度器：触发普通事件，使用优先级队列管理事件处理"""
     def __init__(self):
@@ -52,10 +143,20 @@ class EventDispatcher:
             max_size=5,  # 最大并发事件处理数
             max_memory_mb=10
         )
+        # 正在处理的事件任务。集合同时持有任务的强引用（事件循环只弱引用任务，
+        # 仅用计数代替会让任务可能在执行中被回收）；只在事件循环线程中读写，无需加锁
         self.active_event_handlers = set()
-        self.event_lock = threading.Lock()
         self.event_processing_task = None
         self.event_processing = False
+        # 事件ID只需唯一，用自增序号代替时间戳字符串
+        self._id_counter = itertools.count()
+        # 未注册事件的返回消息缓存，高频探测同一未注册事件时不再重复格式化
+        self._miss_messages: Dict[str, str] = {}
+        # 有新事件入队 / 有处理任务完成时唤醒处理循环，代替固定间隔轮询。
+        # asyncio.Event 会绑定首次等待它的事件循环，因此在启动处理循环时按当前事件循环创建
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._event_available: Optional[asyncio.Event] = None
+        self._slot_available: Optional[asyncio.Event] = None
 
     async def trigger_event(self, event_name: str, priority: int = 5, *args, **kwargs) -> Any:
         """触发事件，使用优先级队列管理事件处理
@@ -66,18 +167,31 @@ class EventDispatcher:
             *args: 位置参数
             **kwargs: 关键字参数
         """
+        return self.trigger_event_nowait(event_name, priority, *args, **kwargs)
+    
+    def trigger_event_nowait(self, event_name: str, priority: int = 5, *args, **kwargs) -> Any:
+        """触发事件的同步版本：入队并返回，不创建协程（需在事件循环中调用）
+        
+        入队和启动处理都不需要等待，高频触发事件的生产者可直接调用，参数和返回值同 trigger_event。
+        """
         handler_cls = self.registry.get(event_name)
         if not handler_cls:
-            return f"事件 {event_name} 未注册"
+            message = self._miss_messages.get(event_name)
+            if message is None:
+                message = f"事件 {event_name} 未注册"
+                # 限制缓存大小，避免大量不同的事件名使其无限增长
+                if len(self._miss_messages) < _MISS_CACHE_SIZE:
+                    self._miss_messages[event_name] = message
+            return message
         
         # 创建事件处理任务
         event_data = {
             'event_name': event_name,
             'handler_cls': handler_cls,
+            'execute': handler_cls.execute,  # 入队时解析一次，处理时直接调用
             'args': args,
             'kwargs': kwargs,
-            'timestamp': time.time(),
-            'event_id': f"{event_name}_{int(time.time() * 1000)}"
+            'event_id': (event_name, next(self._id_counter))
         }
         
         # 将事件加入优先级队列
@@ -85,52 +199,71 @@ class EventDispatcher:
         if not success:
             return f"事件 {event_name} 加入队列失败（队列满或资源不足）"
         
-        # 启动事件处理（如果未运行）
-        if not self.event_processing:
-            await self._start_event_processing()
+        # 启动事件处理（如果未运行）并唤醒处理循环
+        self._ensure_event_processing()
+        self._event_available.set()
         
         return f"事件 {event_name} 已加入处理队列（优先级: {priority}）"
     
     async def _start_event_processing(self) -> None:
         """启动事件处理"""
+        self._ensure_event_processing()
+    
+    def _ensure_event_processing(self) -> None:
+        """启动事件处理循环（如果未运行）；事件循环变化时（如多次 asyncio.run）重建等待用的Event"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # 旧事件循环上的处理循环和处理任务已随其关闭，不再有效
+            self._loop = loop
+            self._event_available = asyncio.Event()
+            self._slot_available = asyncio.Event()
+            self.active_event_handlers.clear()
+            self.event_processing = False
         if not self.event_processing:
             self.event_processing = True
             self.event_processing_task = asyncio.create_task(self._process_events())
+            self.event_processing_task.add_done_callback(self._on_event_processing_done)
+    
+    def _on_event_processing_done(self, task: asyncio.Task) -> None:
+        """处理循环结束（被取消或异常退出）时重置状态，下次触发事件会重新启动"""
+        if task is not self.event_processing_task:
+            return
+        self.event_processing = False
+        self.event_processing_task = None
+        if not task.cancelled() and task.exception() is not None:
+            print(f"事件处理循环异常退出: {task.exception()}")
     
     async def _process_events(self) -> None:
         """处理事件队列"""
         while self.event_processing:
-            # 检查资源限制
-            with self.event_lock:
-                if len(self.active_event_handlers) >= self.event_resource_controller.max_size:
-                    await asyncio.sleep(0.1)
-                    continue
+            # 检查资源限制，并发已满时等待有处理任务完成
+            budget = self.event_resource_controller.max_size - len(self.active_event_handlers)
+            if budget <= 0:
+                self._slot_available.clear()
+                await self._slot_available.wait()
+                continue
             
-            # 从队列获取事件
-            event_data = self.event_queue.get(timeout=0.1)
-            if not event_data:
-                # 队列为空，检查是否继续处理
+            # 按剩余并发额度从队列批量获取事件（一次加锁，不阻塞事件循环）
+            batch = self.event_queue.get_many(budget)
+            if not batch:
+                # 队列为空，等待新事件入队（先清除再复查，避免错过清除前入队的事件）
+                self._event_available.clear()
                 if self.event_queue.empty():
-                    await asyncio.sleep(0.5)
+                    await _wait_event(self._event_available, 0.5)
                 continue
             
-            # 创建事件处理任务
-            handler_coro = self._handle_event_async(event_data)
-            handler_future = asyncio.create_task(handler_coro)
-            
-            with self.event_lock:
-                self.active_event_handlers.add(handler_future)
-            
-            # 设置完成回调
-            handler_future.add_done_callback(
-                lambda f: self._on_event_handler_complete(f)
-            )
+            # 创建事件处理任务；用完成回调释放额度，任务在开始执行前被取消时也会调用
+            for event_data in batch:
+                handler_future = _create_task(self._handle_event_async(event_data))
+                # 急切启动时任务可能已同步完成，只登记仍在运行的任务
+                if not handler_future.done():
+                    self.active_event_handlers.add(handler_future)
+                    handler_future.add_done_callback(self._on_event_handler_complete)
     
     async def _handle_event_async(self, event_data: Dict[str, Any]) -> None:
         """异步处理单个事件"""
         try:
-            handler_cls = event_data['handler_cls']
-            execute = handler_cls.execute
+            execute = event_data['execute']
             
             # 执行事件处理，现在execute函数已经支持依赖注入和调用链
             result = await execute(*event_data['args'], **event_data['kwargs'])
@@ -143,9 +276,9 @@ class EventDispatcher:
             return f"事件处理出错: {e}"
     
     def _on_event_handler_complete(self, future: asyncio.Future) -> None:
-        """事件处理完成回调"""
-        with self.event_lock:
-            self.active_event_handlers.discard(future)
+        """事件处理完成：释放并发额度"""
+        self.active_event_handlers.discard(future)
+        self._slot_available.set()
     
     def stop_event_processing(self) -> None:
         """停止事件处理"""
@@ -195,7 +328,11 @@ class DecisionCommandDispatcher:
     """基于决策树的命令调度器，使用优先级队列管理命令执行"""
     def __init__(self):
         self.registry = ClassNucleus.get_registry()
-        self.tree = self._build_tree()
+        # 自定义决策树（需提供 async evaluate(ctx)）；为 None 时使用内置的判断逻辑
+        self.tree = None
+        # 命令名/别名 -> 处理器类的索引，注册表变化后重建
+        self._cmd_index: Dict[str, _CommandEntry] = {}
+        self._cmd_index_key: Optional[Tuple[int, int]] = None
         
         # 使用优先级队列管理命令执行
         self.command_queue = PriorityQueue(
@@ -207,66 +344,94 @@ class DecisionCommandDispatcher:
             max_size=3,  # 最大并发命令数
             max_memory_mb=5
         )
+        # 正在执行的命令任务，同时持有任务的强引用；只在事件循环线程中读写，无需加锁
         self.active_commands = set()
-        self.command_lock = threading.Lock()
         self.command_processing = False
         self.command_processor_task = None
+        # 命令ID只需唯一，用自增序号代替时间戳字符串
+        self._id_counter = itertools.count()
+        # 有新命令入队 / 有命令执行完成时唤醒处理循环，代替固定间隔轮询。
+        # asyncio.Event 会绑定首次等待它的事件循环，因此在启动处理循环时按当前事件循环创建
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._command_available: Optional[asyncio.Event] = None
+        self._slot_available: Optional[asyncio.Event] = None
 
-    def _build_tree(self) -> DecisionNode:
-        return DecisionNode(
-            condition=lambda ctx: ctx["message"].startswith("/"),
-            if_true=self._check_registered(),
-            if_false=lambda ctx: "这不是一个命令"
-        )
-
-    def _check_registered(self) -> DecisionNode:
-        return DecisionNode(
-            condition=lambda ctx: "handler" in ctx,
-            if_true=self._check_cooldown(),
-            if_false=lambda ctx: f"未知命令: {ctx['command']}"
-        )
-
-    def _check_cooldown(self) -> DecisionNode:
-        return DecisionNode(
-            condition=lambda ctx: ctx.get("cooldown_passed", False),
-            if_true=lambda ctx: ctx.get("exec_result", "命令执行失败"),
-            if_false=lambda ctx: f"命令冷却中，请等待 {ctx['handler'].cooldown} 秒"
-        )
+    async def _reply(self, ctx: Context) -> Any:
+        """根据上下文生成回复
+        
+        内置逻辑只有四种结果，直接按顺序判断，不再构建和遍历决策树；设置了自定义树时交给它评估。
+        """
+        if self.tree is not None:
+            return await self.tree.evaluate(ctx)
+        if not ctx["is_command"]:
+            return "这不是一个命令"
+        if "handler" not in ctx:
+            return f"未知命令: {ctx['command']}"
+        if not ctx.get("cooldown_passed", False):
+            return f"命令冷却中，请等待 {ctx['handler'].cooldown} 秒"
+        return ctx.get("exec_result", "命令执行失败")
 
     def _parse_command(self, message: str) -> Tuple[str, str]:
-        if not message.startswith("/"):
+        # 非命令消息直接返回，不做任何字符串拷贝
+        if message[:1] != "/":
             return "", ""
-        parts = message.strip().split(" ", 1)
-        return parts[0], parts[1] if len(parts) > 1 else ""
+        # 以"/"开头的消息没有前导空白，rstrip 与原先的 strip 等价
+        command, _, args = message.rstrip().partition(" ")
+        return command, args
+
+    def _get_command_index(self) -> Dict[str, _CommandEntry]:
+        """获取命令索引（按注册表版本缓存），同名时先注册的处理器优先
+        
+        索引值为 (处理器类, execute, execute是否为协程函数, arg_parser)，均在建索引时解析一次。
+        """
+        key = (ClassNucleus.get_registry_version(), len(self.registry))
+        if key != self._cmd_index_key:
+            index: Dict[str, _CommandEntry] = {}
+            for cls in self.registry.values():
+                command = getattr(cls, "command", None)
+                aliases = getattr(cls, "aliases", None) or ()
+                if command is None and not aliases:
+                    continue
+                execute = getattr(cls, "execute", None)
+                entry = (cls, execute, asyncio.iscoroutinefunction(execute),
+                         getattr(cls, "arg_parser", None))
+                if command is not None:
+                    index.setdefault(command, entry)
+                for alias in aliases:
+                    index.setdefault(alias, entry)
+            self._cmd_index = index
+            self._cmd_index_key = key
+        return self._cmd_index
 
     def _get_handler(self, ctx: Context) -> bool:
-        cmd = ctx["command"]
-        for cls in self.registry.values():
-            if getattr(cls, "command", None) == cmd or cmd in getattr(cls, "aliases", []):
-                ctx["handler"] = cls
-                return True
-        return False
+        entry = self._get_command_index().get(ctx["command"])
+        if entry is None:
+            return False
+        ctx["handler"] = entry[0]
+        ctx["command_entry"] = entry
+        return True
 
-    async def _check_cooldown_flag(self, ctx: Context) -> None:
+    def _check_cooldown_flag(self, ctx: Context) -> None:
         handler = ctx["handler"]
         if handler.cooldown <= 0:
             ctx["cooldown_passed"] = True
             return
-        async with handler.cooldown_lock:
-            now = time.time()
-            if now - handler.last_executed >= handler.cooldown:
-                handler.last_executed = now
-                ctx["cooldown_passed"] = True
-            else:
-                ctx["cooldown_passed"] = False
+        # 检查与更新之间没有await，在同一事件循环内不会被其他协程打断，无需加锁
+        # 冷却只比较时间差，使用单调时钟，不受系统时间调整影响
+        now = time.monotonic()
+        if now - handler.last_executed >= handler.cooldown:
+            handler.last_executed = now
+            ctx["cooldown_passed"] = True
+        else:
+            ctx["cooldown_passed"] = False
 
     async def _execute(self, ctx: Context) -> None:
-        handler = ctx["handler"]
+        _, exec_func, exec_is_coro, arg_parser = ctx["command_entry"]
         args = ctx["args"]
-        parsed = handler.arg_parser(args) if handler.arg_parser else {"args": args.split()}
-        exec_func = handler.execute
+        parsed = arg_parser(args) if arg_parser else {"args": args.split()}
         # execute函数已经支持依赖注入和调用链，直接调用即可
-        ctx["exec_result"] = await exec_func(**parsed)
+        result = exec_func(**parsed)
+        ctx["exec_result"] = await result if exec_is_coro else result
 
     async def handle(self, message: str, priority: int = 5) -> str:
         """处理命令，使用优先级队列管理命令执行
@@ -275,28 +440,32 @@ class DecisionCommandDispatcher:
             message: 命令消息
             priority: 命令优先级（数字越小优先级越高，默认5）
         """
+        # 大多数消息不是命令：未设置自定义树时直接返回，不解析也不构建上下文
+        if message[:1] != "/" and self.tree is None:
+            return "这不是一个命令"
+        
         command, args = self._parse_command(message)
-        ctx: Context = {"message": message, "command": command, "args": args}
+        # 是否为命令只在解析时判断一次，决策树直接读取该标志
+        ctx: Context = {"message": message, "command": command, "args": args, "is_command": command != ""}
 
         if command and self._get_handler(ctx):
-            await self._check_cooldown_flag(ctx)
+            self._check_cooldown_flag(ctx)
             if ctx.get("cooldown_passed"):
                 # 将命令加入优先级队列执行
                 return await self._queue_command(ctx, priority)
             else:
                 # 冷却中的命令直接返回结果
-                return await self.tree.evaluate(ctx)
+                return await self._reply(ctx)
         else:
             # 非命令消息直接评估
-            return await self.tree.evaluate(ctx)
+            return await self._reply(ctx)
     
     async def _queue_command(self, ctx: Context, priority: int) -> str:
-        """将命令加入优先级队列执行"""
+        """将命令加入优先级队列执行（ctx 的所有权转交给队列，调用方之后不再使用它）"""
         command_data = {
-            'context': ctx.copy(),
+            'context': ctx,
             'priority': priority,
-            'timestamp': time.time(),
-            'command_id': f"{ctx['command']}_{int(time.time() * 1000)}"
+            'command_id': (ctx['command'], next(self._id_counter))
         }
         
         # 将命令加入优先级队列
@@ -304,46 +473,66 @@ class DecisionCommandDispatcher:
         if not success:
             return f"命令 {ctx['command']} 加入队列失败（队列满或资源不足）"
         
-        # 启动命令处理（如果未运行）
-        if not self.command_processing:
-            await self._start_command_processing()
+        # 启动命令处理（如果未运行）并唤醒处理循环
+        self._ensure_command_processing()
+        self._command_available.set()
         
         return f"命令 {ctx['command']} 已加入执行队列（优先级: {priority}）"
     
     async def _start_command_processing(self) -> None:
         """启动命令处理"""
+        self._ensure_command_processing()
+    
+    def _ensure_command_processing(self) -> None:
+        """启动命令处理循环（如果未运行）；事件循环变化时（如多次 asyncio.run）重建等待用的Event"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # 旧事件循环上的处理循环和执行任务已随其关闭，不再有效
+            self._loop = loop
+            self._command_available = asyncio.Event()
+            self._slot_available = asyncio.Event()
+            self.active_commands.clear()
+            self.command_processing = False
         if not self.command_processing:
             self.command_processing = True
             self.command_processor_task = asyncio.create_task(self._process_commands())
+            self.command_processor_task.add_done_callback(self._on_command_processing_done)
+    
+    def _on_command_processing_done(self, task: asyncio.Task) -> None:
+        """处理循环结束（被取消或异常退出）时重置状态，下次提交命令会重新启动"""
+        if task is not self.command_processor_task:
+            return
+        self.command_processing = False
+        self.command_processor_task = None
+        if not task.cancelled() and task.exception() is not None:
+            print(f"命令处理循环异常退出: {task.exception()}")
     
     async def _process_commands(self) -> None:
         """处理命令队列"""
         while self.command_processing:
-            # 检查资源限制
-            with self.command_lock:
-                if len(self.active_commands) >= self.command_resource_controller.max_size:
-                    await asyncio.sleep(0.1)
-                    continue
+            # 检查资源限制，并发已满时等待有命令执行完成
+            budget = self.command_resource_controller.max_size - len(self.active_commands)
+            if budget <= 0:
+                self._slot_available.clear()
+                await self._slot_available.wait()
+                continue
             
-            # 从队列获取命令
-            command_data = self.command_queue.get(timeout=0.1)
-            if not command_data:
-                # 队列为空，检查是否继续处理
+            # 按剩余并发额度从队列批量获取命令（一次加锁，不阻塞事件循环）
+            batch = self.command_queue.get_many(budget)
+            if not batch:
+                # 队列为空，等待新命令入队（先清除再复查，避免错过清除前入队的命令）
+                self._command_available.clear()
                 if self.command_queue.empty():
-                    await asyncio.sleep(0.5)
+                    await _wait_event(self._command_available, 0.5)
                 continue
             
-            # 创建命令执行任务
-            command_coro = self._execute_command_async(command_data)
-            command_future = asyncio.create_task(command_coro)
-            
-            with self.command_lock:
-                self.active_commands.add(command_future)
-            
-            # 设置完成回调
-            command_future.add_done_callback(
-                lambda f: self._on_command_complete(f)
-            )
+            # 创建命令执行任务；用完成回调释放额度，任务在开始执行前被取消时也会调用
+            for command_data in batch:
+                command_future = _create_task(self._execute_command_async(command_data))
+                # 急切启动时任务可能已同步完成，只登记仍在运行的任务
+                if not command_future.done():
+                    self.active_commands.add(command_future)
+                    command_future.add_done_callback(self._on_command_complete)
     
     async def _execute_command_async(self, command_data: Dict[str, Any]) -> str:
         """异步执行命令"""
@@ -351,13 +540,13 @@ class DecisionCommandDispatcher:
             ctx = command_data['context']
             
             # 重新检查冷却状态（可能在队列中等待了一段时间）
-            await self._check_cooldown_flag(ctx)
+            self._check_cooldown_flag(ctx)
             if not ctx.get("cooldown_passed"):
                 return f"命令 {ctx['command']} 冷却中，请等待"
             
             # 执行命令
             await self._execute(ctx)
-            result = await self.tree.evaluate(ctx)
+            result = await self._reply(ctx)
             
             print(f"命令执行成功: {ctx['command']} (优先级: {command_data['priority']})")
             return result
@@ -367,9 +556,9 @@ class DecisionCommandDispatcher:
             return f"命令执行出错: {e}"
     
     def _on_command_complete(self, future: asyncio.Future) -> None:
-        """命令执行完成回调"""
-        with self.command_lock:
-            self.active_commands.discard(future)
+        """命令执行完成：释放并发额度"""
+        self.active_commands.discard(future)
+        self._slot_available.set()
     
     def stop_command_processing(self) -> None:
         """停止命令处理"""
@@ -424,6 +613,9 @@ class TimeTaskScheduler:
         self.running = False
         self.task: Optional[asyncio.Task] = None
         self.time_tasks: List[Dict[str, Any]] = []  # 存储任务详情
+        # 按下次到期时间排列的堆：(到期时间, 优先级, 序号, 任务)，堆顶即最先到期的任务
+        self._schedule: List[Tuple[float, int, int, Dict[str, Any]]] = []
+        self._schedule_tasks: Optional[List[Dict[str, Any]]] = None  # 构建堆时的任务列表
         self.check_interval = 1  # 检查周期（秒）
         
         # 使用优先级队列管理任务执行
@@ -435,57 +627,92 @@ class TimeTaskScheduler:
             max_size=10,  # 最大并发任务数
             max_memory_mb=100  # 最大内存使用
         )
+        # 正在执行的定时任务，同时持有任务的强引用；只在事件循环线程中读写，无需加锁
         self.active_tasks = set()
-        self.task_lock = threading.Lock()
+        # 任务ID只需唯一，用自增序号代替时间戳字符串
+        self._id_counter = itertools.count()
+        # 从注册表扫描出的 (优先级, 间隔, 处理函数, 是否为协程函数)，按注册表版本缓存
+        self._task_defs: List[Tuple[int, float, Callable, bool]] = []
+        self._task_defs_key: Optional[Tuple[int, int]] = None
 
-    def load_time_tasks(self) -> None:
-        """从注册器加载所有定时任务"""
-        self.time_tasks.clear()
+    def _get_task_defs(self) -> List[Tuple[int, float, Callable, bool]]:
+        """获取已排序的定时任务定义，注册表未变化时不重新扫描"""
+        key = (ClassNucleus.get_registry_version(), len(self.registry))
+        if key == self._task_defs_key:
+            return self._task_defs
+        
+        defs = []
         for name, cls in self.registry.items():
             if hasattr(cls, 'interval') and hasattr(cls, 'execute'):
                 interval = getattr(cls, 'interval', 0)
                 if interval > 0:  # 只加载有时间间隔的任务
-                    self.time_tasks.append({
-                        'priority': getattr(cls, 'priority', 1),
-                        'interval': interval,
-                        'handler': cls.execute,
-                        'last_executed': 0  # 设置为0，确保第一次会立即执行
-                    })
+                    handler = cls.execute
+                    defs.append((getattr(cls, 'priority', 1), interval, handler,
+                                 asyncio.iscoroutinefunction(handler)))
 
         # 按优先级排序（数字越小优先级越高）
-        self.time_tasks.sort(key=lambda x: x['priority'])
+        defs.sort(key=lambda x: x[0])
+        self._task_defs = defs
+        self._task_defs_key = key
+        return defs
+
+    def load_time_tasks(self) -> None:
+        """从注册器加载所有定时任务（每次加载都重置执行时间）"""
+        self.time_tasks.clear()
+        # 原地重新填充的列表身份和长度可能不变，需显式让到期时间堆失效
+        self._schedule_tasks = None
+        for priority, interval, handler, is_async in self._get_task_defs():
+            self.time_tasks.append({
+                'priority': priority,
+                'interval': interval,
+                'handler': handler,
+                'is_async': is_async,
+                # 基于单调时钟；设为负无穷，确保第一次会立即执行
+                'last_executed': float('-inf')
+            })
         print(f"已加载 {len(self.time_tasks)} 个定时任务")
 
     async def execute_due_tasks(self) -> None:
         """执行所有到期的定时任务，使用优先级队列管理"""
-        current_time = time.time()
-
-        # 将所有到期的任务加入优先级队列
-        for task in self.time_tasks:
-            elapsed = current_time - task['last_executed']
-            if elapsed >= task['interval']:
-                task_data = {
-                    'task': task,
-                    'scheduled_time': current_time,
-                    'task_id': f"{task['handler'].__name__}_{int(current_time * 1000)}"
-                }
-                success = self.task_queue.put(task_data, priority=task['priority'])
-                if success:
-                    task['last_executed'] = current_time  # 更新任务的上次执行时间
-                else:
-                    print(f"警告: 任务加入队列失败 - {task['handler'].__name__}")
+        # 到期判断只需时间差，使用单调时钟；scheduled_time 对外展示，仍用系统时间
+        current_time = time.monotonic()
+        scheduled_time = time.time()
+        schedule = self._get_schedule()
+
+        # 从堆顶取出所有到期的任务，按优先级加入优先级队列
+        due = []
+        while schedule and schedule[0][0] <= current_time:
+            due.append(heappop(schedule))
+        due.sort(key=lambda entry: (entry[1], entry[2]))
+        
+        for next_fire, priority, seq, task in due:
+            task_data = {
+                'task': task,
+                'scheduled_time': scheduled_time,
+                'task_id': (task['handler'].__name__, next(self._id_counter))
+            }
+            success = self.task_queue.put(task_data, priority=task['priority'])
+            if success:
+                task['last_executed'] = current_time  # 更新任务的上次执行时间
+                next_fire = current_time + task['interval']
+            else:
+                print(f"警告: 任务加入队列失败 - {task['handler'].__name__}")
+            heappush(schedule, (next_fire, priority, seq, task))
         
         # 处理队列中的任务
         await self._process_queued_tasks()
 
     async def _process_queued_tasks(self) -> None:
         """处理优先级队列中的任务，考虑资源限制"""
+        estimated_memory = 1  # 假设每个任务使用1MB内存
+        # 完成回调在循环外创建一次，所有任务共用
+        on_complete = functools.partial(self._on_task_complete, memory_used=estimated_memory)
+        
         while not self.task_queue.empty():
             # 检查资源限制
-            with self.task_lock:
-                if len(self.active_tasks) >= self.resource_controller.max_size:
-                    print(f"资源限制: 当前活跃任务数 {len(self.active_tasks)} 已达到最大值")
-                    break
+            if len(self.active_tasks) >= self.resource_controller.max_size:
+                print(f"资源限制: 当前活跃任务数 {len(self.active_tasks)} 已达到最大值")
+                break
             
             # 从队列获取任务
             task_data = self.task_queue.get(timeout=0.1)
@@ -493,7 +720,6 @@ class TimeTaskScheduler:
                 break
             
             # 检查内存限制
-            estimated_memory = 1  # 假设每个任务使用1MB内存
             if (self.resource_controller.current_memory_mb + estimated_memory > 
                 self.resource_controller.max_memory_mb):
                 print(f"内存限制: 当前内存使用 {self.resource_controller.current_memory_mb}MB 已达到最大值")
@@ -506,22 +732,23 @@ class TimeTaskScheduler:
             
             # 创建异步任务
             task_coro = self._run_task_async(task_data)
-            task_future = asyncio.create_task(task_coro)
+            task_future = _create_task(task_coro)
             
-            with self.task_lock:
-                self.active_tasks.add(task_future)
+            self.active_tasks.add(task_future)
             
             # 设置完成回调
-            task_future.add_done_callback(
-                lambda f: self._on_task_complete(f, estimated_memory)
-            )
+            task_future.add_done_callback(on_complete)
     
     async def _run_task_async(self, task_data: Dict[str, Any]) -> None:
         """异步运行任务"""
         task = task_data['task']
         try:
             handler = task['handler']
-            if asyncio.iscoroutinefunction(handler):
+            # 加载任务时已判断过是否为协程函数；兼容旧接口传入的任务字典
+            is_async = task.get('is_async')
+            if is_async is None:
+                is_async = asyncio.iscoroutinefunction(handler)
+            if is_async:
                 await handler()
             else:
                 # 对于同步函数，在线程池中运行
@@ -533,8 +760,7 @@ class TimeTaskScheduler:
     
     def _on_task_complete(self, future: asyncio.Future, memory_used: float) -> None:
         """任务完成回调"""
-        with self.task_lock:
-            self.active_tasks.discard(future)
+        self.active_tasks.discard(future)
         self.resource_controller.current_memory_mb -= memory_used
     
     async def _run_task(self, task: Dict[str, Any]) -> None:
@@ -542,7 +768,7 @@ class TimeTaskScheduler:
         task_data = {
             'task': task,
             'scheduled_time': time.time(),
-            'task_id': f"{task['handler'].__name__}_{int(time.time() * 1000)}"
+            'task_id': (task['handler'].__name__, next(self._id_counter))
         }
         await self._run_task_async(task_data)
 
@@ -550,7 +776,32 @@ class TimeTaskScheduler:
         """调度器主循环"""
         while self.running:
             await self.execute_due_tasks()
-            await asyncio.sleep(self.check_interval)  # 使用固定的检查周期
+            await asyncio.sleep(self._next_check_delay())
+    
+    def _get_schedule(self) -> List[Tuple[float, int, int, Dict[str, Any]]]:
+        """获取到期时间堆，time_tasks 被替换、增删或重新加载后重新构建"""
+        tasks = self.time_tasks
+        if tasks is not self._schedule_tasks or len(tasks) != len(self._schedule):
+            self._schedule = [
+                (task['last_executed'] + task['interval'], task['priority'], seq, task)
+                for seq, task in enumerate(tasks)
+            ]
+            heapify(self._schedule)
+            self._schedule_tasks = tasks
+        return self._schedule
+    
+    def _next_check_delay(self) -> float:
+        """距下一个任务到期的时间，不超过检查周期
+        
+        已到期但未能入队的任务（队列已满）按检查周期重试，避免空转。
+        """
+        schedule = self._get_schedule()
+        if not schedule:
+            return self.check_interval
+        next_due = schedule[0][0] - time.monotonic()
+        if next_due <= 0:
+            return self.check_interval
+        return min(next_due, self.check_interval)
 
     async def start(self) -> None:
         """启动调度器"""
@@ -604,7 +855,7 @@ class TimeTaskScheduler:
                     handler = item_data['task']['handler']
                     task_name = getattr(handler, '__name__', str(handler))
                 elif 'task_id' in item_data:
-                    task_name = item_data['task_id']
+                    task_name = _format_id(item_data['task_id'])
                 else:
                     task_name = "未知任务"
                 
@@ -612,7 +863,7 @@ class TimeTaskScheduler:
                     'task_name': task_name,
                     'priority': priority,
                     'scheduled_time': item_data.get('scheduled_time', time.time()),
-                    'task_id': item_data.get('task_id', 'unknown')
+                    'task_id': _format_id(item_data.get('task_id', 'unknown'))
                 }
                 pending_tasks.append(task_info)
             except Exception as e:
@@ -626,23 +877,74 @@ class ReTaskScheduler:
     
     def __init__(self):
         self.registry = ClassNucleus.get_registry()
+        # 正则处理器缓存，注册表变化后重建
+        self._handlers_cache: list = []
+        self._handlers_key: Optional[Tuple[int, int]] = None
+        # 所有正则的合并预筛选，一次扫描即可排除不匹配任何处理器的内容
+        self._prefilter: Optional[re.Pattern] = None
     
     def _get_regex_handlers(self) -> list:
-        """获取所有正则任务处理器"""
+        """获取所有正则任务处理器（正则在构建时预编译，结果按注册表版本缓存）"""
+        key = (ClassNucleus.get_registry_version(), len(self.registry))
+        if key == self._handlers_key:
+            return self._handlers_cache
+        
         handlers = []
         for name, cls in self.registry.items():
             if hasattr(cls, 'rule'):
+                pattern = cls.rule
+                if isinstance(pattern, str):
+                    try:
+                        pattern = re.compile(pattern)
+                    except re.error as e:
+                        print(f"正则表达式编译错误: {name}: {e}")
+                        pattern = None
                 handlers.append({
                     'name': getattr(cls, 'fun_name', name),
-                    'pattern': cls.rule,
+                    'pattern': pattern,
                     'handler': cls.execute,
                     'priority': getattr(cls, 'priority', 1)
                 })
         
         # 按优先级排序（数字越小优先级越高）
         handlers.sort(key=lambda x: x['priority'])
+        self._handlers_cache = handlers
+        self._handlers_key = key
+        self._prefilter = self._build_prefilter(handlers)
         return handlers
     
+    @staticmethod
+    def _build_prefilter(handlers: list) -> Optional[re.Pattern]:
+        """把所有正则合并为一个分支表达式，用于判断内容是否可能命中任一处理器
+        
+        合并后的表达式只作预筛选，命中后仍逐个搜索以得到各自的匹配对象。
+        正则的标志不一致、含反向引用或 VERBOSE 时无法安全合并，返回 None。
+        """
+        patterns = [info['pattern'] for info in handlers if info['pattern'] is not None]
+        if not patterns:
+            return None
+        flags = getattr(patterns[0], 'flags', None)
+        sources = []
+        for pattern in patterns:
+            source = getattr(pattern, 'pattern', None)
+            if (not isinstance(source, str) or pattern.flags != flags or flags & re.VERBOSE
+                    or _BACKREF_RE.search(source)):
+                return None
+            sources.append(f"(?:{source})")
+        try:
+            return re.compile("|".join(sources), flags)
+        except re.error:
+            return None
+    
+    @staticmethod
+    def _search(pattern: Any, content: str) -> Optional[re.Match]:
+        """用预编译的正则匹配内容，只搜索一次并返回匹配对象"""
+        try:
+            return pattern.search(content) if hasattr(pattern, 'search') else None
+        except Exception as e:
+            print(f"正则表达式匹配错误: {e}")
+            return None
+    
     async def trigger(self, task_name: str, content: str) -> list[str]:
         """
         触发正则任务
@@ -659,28 +961,12 @@ class ReTaskScheduler:
         
         for handler_info in handlers:
             if handler_info['name'] == task_name:
-                pattern = handler_info['pattern']
+                match_obj = self._search(handler_info['pattern'], content)
                 
-                # 检查正则表达式匹配
-                regex_matches = False
-                try:
-                    if isinstance(pattern, str):
-                        regex_matches = bool(re.search(pattern, content))
-                    else:
-                        regex_matches = bool(pattern.search(content)) if hasattr(pattern, 'search') else False
-                except Exception as e:
-                    print(f"正则表达式匹配错误: {e}")
-                
-                if regex_matches:
+                if match_obj is not None:
                     try:
                         handler = handler_info['handler']
                         
-                        # 获取匹配对象
-                        if isinstance(pattern, str):
-                            match_obj = re.search(pattern, content)
-                        else:
-                            match_obj = pattern.search(content) if hasattr(pattern, 'search') else None
-                        
                         # 调用处理函数时传递文本和匹配对象，handler已经支持依赖注入和调用链
                         result = await handler(content, match_obj)
                             
@@ -706,30 +992,19 @@ class ReTaskScheduler:
         handlers = self._get_regex_handlers()
         results = []
         
+        # 合并正则一次扫描未命中时，任何处理器都不会匹配
+        prefilter = self._prefilter
+        if prefilter is not None and self._search(prefilter, content) is None:
+            return results
+        
         for handler_info in handlers:
-            pattern = handler_info['pattern']
+            match_obj = self._search(handler_info['pattern'], content)
             
-            # 检查内容是否匹配正则表达式
-            regex_matches = False
-            try:
-                if isinstance(pattern, str):
-                    regex_matches = bool(re.search(pattern, content))
-                else:
-                    regex_matches = bool(pattern.search(content)) if hasattr(pattern, 'search') else False
-            except Exception as e:
-                print(f"正则表达式匹配错误: {e}")
-            
-            if regex_matches:
+            if match_obj is not None:
                 try:
                     handler = handler_info['handler']
                     task_name = handler_info['name']
                     
-                    # 获取匹配对象
-                    if isinstance(pattern, str):
-                        match_obj = re.search(pattern, content)
-                    else:
-                        match_obj = pattern.search(content) if hasattr(pattern, 'search') else None
-                    
                     # 调用处理函数时传递文本和匹配对象，handler已经支持依赖注入和调用链
                     result = await handler(content, match_obj)
                     
@@ -1,6 +1,7 @@
 """
 装饰器框架安装配置
 """
+import os
 from setuptools import setup, find_packages
 from pathlib import Path
 
@@ -12,6 +13,23 @@ long_description = (this_directory / "README.md").read_text(encoding='utf-8')
 with open("requirements.txt", "r", encoding="utf-8") as f:
     requirements = [line.strip() for line in f if line.strip() and not line.startswith("#")]
 
+# 可选：设置 DECORATOR_FRAMEWORK_MYPYC=1 时用mypyc编译任务管理器核心
+# 编译前需先在构建环境中安装mypy：pip install mypy
+# 未编译时直接使用纯Python实现
+ext_modules = []
+if os.environ.get("DECORATOR_FRAMEWORK_MYPYC") == "1":
+    try:
+        from mypyc.build import mypycify
+    except ImportError as e:
+        raise RuntimeError(
+            "DECORATOR_FRAMEWORK_MYPYC=1 需要先安装mypy（pip install mypy），"
+            "或去掉该环境变量以安装纯Python版本"
+        ) from e
+    ext_modules = mypycify([
+        "--follow-imports=silent",
+        "nucleus/core/task_manager.py",
+    ])
+
 setup(
     name="decorator-framework",
     version="1.0.5",  # 更新版本号 - 修复文档验证问题
@@ -37,6 +55,7 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=requirements,
+    ext_modules=ext_modules,
     extras_require={
         "dev": [
             "pytest>=7.0.0",
@@ -45,6 +64,9 @@ setup(
             "flake8>=5.0.0",
             "mypy>=1.0.0",
         ],
+        "uvloop": [
+            "uvloop>=0.17.0; sys_platform != 'win32'",
+        ],
         "docs": [
             "sphinx>=5.0.0",
             "sphinx-rtd-theme>=1.2.0",
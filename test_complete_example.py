@@ -91,4 +91,7 @@ async def main():
     print("\n✅ 演示完成！")
 
 if __name__ == "__main__":
+    # 安装了uvloop时使用它作为事件循环（可选）
+    from nucleus import enable_uvloop
+    enable_uvloop()
     asyncio.run(main())
\ No newline at end of file
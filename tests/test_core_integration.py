@@ -2,6 +2,8 @@
 核心功能集成测试
 """
 import asyncio
+import copy
+import pickle
 import pytest
 from typing import Optional, Any
 
@@ -19,7 +21,9 @@ from nucleus.core import (
     CallChain,
     ChainInterceptor,
     ChainContext,
-    TaskStatus
+    TaskHandle,
+    TaskStatus,
+    get_current_chain_context
 )
 
 
@@ -195,6 +199,52 @@ class TestCoreIntegration:
         assert interceptor.after_count == 0
         assert interceptor.error_count == 1
     
+    @pytest.mark.asyncio
+    async def test_current_chain_context(self):
+        """测试当前调用链上下文"""
+        call_chain = CallChain()
+        seen = []
+        
+        async def inner():
+            seen.append(get_current_chain_context().task_id)
+        
+        async def outer():
+            seen.append(get_current_chain_context().task_id)
+            await call_chain.execute(inner, task_id="inner")
+            seen.append(get_current_chain_context().task_id)
+        
+        assert get_current_chain_context() is None
+        await call_chain.execute(outer, task_id="outer")
+        
+        # 嵌套调用链结束后恢复外层上下文
+        assert seen == ["outer", "inner", "outer"]
+        assert get_current_chain_context() is None
+    
+    @pytest.mark.asyncio
+    async def test_chain_context_reset_when_after_execute_raises(self):
+        """测试 after_execute 抛出异常时仍恢复调用链上下文"""
+        class FailingInterceptor(ChainInterceptor):
+            async def before_execute(self, context: ChainContext) -> None:
+                pass
+            
+            async def after_execute(self, context: ChainContext) -> None:
+                raise RuntimeError("after_execute_error")
+            
+            async def on_error(self, context: ChainContext, error: Exception) -> None:
+                pass
+        
+        call_chain = CallChain()
+        call_chain.add_interceptor(FailingInterceptor())
+        
+        async def test_function():
+            return "chain_result"
+        
+        with pytest.raises(RuntimeError, match="after_execute_error"):
+            await call_chain.execute(test_function, task_id="failing_after")
+        
+        assert get_current_chain_context() is None
+        assert call_chain.get_active_chains() == []
+    
     @pytest.mark.asyncio
     async def test_task_with_chain_decorator(self):
         """测试链式任务装饰器"""
@@ -295,6 +345,53 @@ class TestCoreIntegration:
         assert task_info is not None
         assert task_info.status == TaskStatus.TIMEOUT
     
+    @pytest.mark.asyncio
+    async def test_task_handle(self):
+        """测试任务句柄"""
+        task_manager = get_task_manager()
+        
+        async def handle_task():
+            return "handle_result"
+        
+        handle = task_manager.create_task(handle_task(), name="handle_task")
+        
+        # 句柄可以当作任务ID使用
+        assert isinstance(handle, TaskHandle)
+        assert isinstance(handle, str)
+        assert handle.task_id == handle
+        assert task_manager.get_task_info(handle).name == "handle_task"
+        
+        # 任务结束后仍可通过句柄获取结果
+        await asyncio.sleep(0)
+        assert await task_manager.wait_for_task_async(handle) == "handle_result"
+        
+        # 句柄可以复制和序列化，序列化后得到任务ID字符串
+        assert copy.copy(handle) is handle
+        assert copy.deepcopy({"id": handle})["id"] is handle
+        restored = pickle.loads(pickle.dumps(handle))
+        assert type(restored) is str
+        assert restored == handle.task_id
+    
+    @pytest.mark.asyncio
+    async def test_cleanup_completed_tasks(self):
+        """测试清理已完成任务"""
+        task_manager = TaskManager()
+        
+        async def quick_task():
+            return "done"
+        
+        task_id = task_manager.create_task(quick_task(), name="cleanup_task")
+        await task_manager.wait_for_task_async(task_id)
+        
+        # 未到期的任务不会被清理
+        assert task_manager.cleanup_completed_tasks(max_age_seconds=3600) == 0
+        assert task_manager.get_task_info(task_id) is not None
+        
+        # 到期后被清理
+        assert task_manager.cleanup_completed_tasks(max_age_seconds=-1) == 1
+        assert task_manager.get_task_info(task_id) is None
+        assert task_manager.cleanup_completed_tasks(max_age_seconds=-1) == 0
+    
     def test_integration_singleton(self):
         """测试集成器单例"""
         integration1 = get_framework_integration()
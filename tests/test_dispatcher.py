@@ -0,0 +1,127 @@
+"""
+调度器测试
+"""
+import asyncio
+import pytest
+from decorators import on, command_on, time_on
+from nucleus.dispatcher import EventDispatcher, DecisionCommandDispatcher, TimeTaskScheduler
+
+
+async def _drain(condition, timeout: float = 1.0) -> None:
+    """让出事件循环直到条件满足或超时"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition() and loop.time() < deadline:
+        await asyncio.sleep(0.01)
+
+
+class TestEventDispatcher:
+    """测试事件调度器"""
+    
+    def test_reuse_across_event_loops(self):
+        """测试同一调度器在多次 asyncio.run 中使用"""
+        seen = []
+        
+        @on("dispatcher_loop_reuse").execute()
+        async def handler(value):
+            seen.append(value)
+        
+        dispatcher = EventDispatcher()
+        
+        async def run(value):
+            dispatcher.trigger_event_nowait("dispatcher_loop_reuse", 5, value)
+            await _drain(lambda: value in seen)
+        
+        asyncio.run(run(1))
+        asyncio.run(run(2))
+        
+        # 启用框架集成时处理器可能被调用链重复执行，只检查每次运行的事件都被处理
+        assert set(seen) == {1, 2}
+        assert dispatcher.event_queue.qsize() == 0
+    
+    def test_cancelled_handler_releases_slot(self):
+        """测试处理任务在开始执行前被取消时也释放并发额度"""
+        
+        @on("dispatcher_cancel_before_start").execute()
+        async def handler():
+            await asyncio.sleep(1)
+        
+        dispatcher = EventDispatcher()
+        
+        async def run():
+            dispatcher.trigger_event_nowait("dispatcher_cancel_before_start")
+            # 让处理循环取出事件并创建处理任务，任务尚未开始执行
+            await asyncio.sleep(0)
+            pending = list(dispatcher.active_event_handlers)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            await asyncio.sleep(0)
+            dispatcher.stop_event_processing()
+            return pending
+        
+        assert asyncio.run(run())
+        assert not dispatcher.active_event_handlers
+
+
+class TestDecisionCommandDispatcher:
+    """测试命令调度器"""
+    
+    def test_reuse_across_event_loops(self):
+        """测试同一调度器在多次 asyncio.run 中使用"""
+        seen = []
+        
+        @command_on("dispatcher_loop_cmd", "/loop_reuse").execute()
+        async def handler(args=None):
+            seen.append(asyncio.get_running_loop())
+        
+        dispatcher = DecisionCommandDispatcher()
+        
+        loops = []
+        
+        async def run():
+            loop = asyncio.get_running_loop()
+            loops.append(loop)
+            await dispatcher.handle("/loop_reuse")
+            await _drain(lambda: loop in seen)
+        
+        asyncio.run(run())
+        asyncio.run(run())
+        
+        # 两次运行的命令都在各自的事件循环中执行
+        assert all(loop in seen for loop in loops)
+        assert dispatcher.command_queue.qsize() == 0
+
+
+class TestTimeTaskScheduler:
+    """测试定时任务调度器"""
+    
+    def test_reload_time_tasks(self):
+        """测试重新加载定时任务后按新任务调度"""
+        
+        @time_on("scheduler_reload_task", interval=3600).execute()
+        async def reload_task():
+            return "done"
+        
+        scheduler = TimeTaskScheduler()
+        
+        async def run():
+            scheduler.load_time_tasks()
+            await scheduler.execute_due_tasks()
+            
+            # 重新加载得到同样数量的新任务字典，应立即按新任务调度
+            scheduler.load_time_tasks()
+            await scheduler.execute_due_tasks()
+            await asyncio.gather(*scheduler.active_tasks)
+        
+        asyncio.run(run())
+        
+        # 堆中的任务就是重新加载后的任务，且都已执行
+        loaded = {id(task) for task in scheduler.time_tasks}
+        assert loaded
+        assert {id(entry[3]) for entry in scheduler._get_schedule()} == loaded
+        assert all(task['last_executed'] != float('-inf') for task in scheduler.time_tasks)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -5,9 +5,13 @@
 用于验证装饰器框架的集成功能
 """
 
+import asyncio
 import unittest
+from unittest import mock
 from decorators import on
 from nucleus import dispatcher
+from nucleus.Myclass import ClassNucleus
+from nucleus.core import get_framework_integration
 
 
 class TestIntegration(unittest.TestCase):
@@ -51,6 +55,24 @@ class TestIntegration(unittest.TestCase):
         self.assertTrue(callable(decorated_handler2))
         self.assertEqual(decorated_handler1(), "handler1")
         self.assertEqual(decorated_handler2(), "handler2")
+    
+    def test_injection_wrapper_built_once(self):
+        """测试依赖注入包装在注册时创建，调用时不再重复包装"""
+        @on('integration_inject_once').execute()
+        async def handler(value):
+            return value
+        
+        execute = ClassNucleus.get_registry()['integration_inject_once'].execute
+        framework = get_framework_integration()
+        with mock.patch.object(framework, 'inject_dependencies', wraps=framework.inject_dependencies) as spy:
+            async def run():
+                return [await execute(1), await execute(2)]
+            
+            results = asyncio.run(run())
+        
+        self.assertIn(1, results)
+        self.assertIn(2, results)
+        spy.assert_not_called()
 
 
 if __name__ == '__main__':
@@ -3,7 +3,8 @@
 """
 import pytest
 import time
-from nucleus.data.priority_queue import PriorityQueue, PriorityQueueItem, ResourceController
+from nucleus.data.priority_queue import PriorityQueue, BucketPriorityQueue, PriorityQueueItem, ResourceController
+from nucleus.data.spsc_queue import SPSCQueue
 
 
 class TestPriorityQueueItem:
@@ -20,7 +21,6 @@ class TestPriorityQueueItem:
     def test_item_comparison(self):
         """测试项的比较"""
         item1 = PriorityQueueItem("data1", priority=1)
-        time.sleep(0.01)  # 确保时间戳不同
         item2 = PriorityQueueItem("data2", priority=2)
         
         assert item1 < item2  # 优先级1 < 优先级2
@@ -29,10 +29,14 @@ class TestPriorityQueueItem:
     def test_item_equal_priority_comparison(self):
         """测试相同优先级的比较"""
         item1 = PriorityQueueItem("data1", priority=1)
-        time.sleep(0.01)  # 确保时间戳不同
         item2 = PriorityQueueItem("data2", priority=1)
         
         assert item1 < item2  # 先创建的优先级更高
+        assert not (item2 < item1)
+        
+        # 时间戳相同时按创建序号排序
+        item3 = PriorityQueueItem("data3", priority=1, timestamp=item1.timestamp)
+        assert item1 < item3
 
 
 class TestResourceController:
@@ -68,6 +72,20 @@ class TestResourceController:
         controller2.add_item(0.9)
         assert controller2.can_add_item(0.2) == False
     
+    def test_try_add_item(self):
+        """测试检查并占用资源"""
+        controller = ResourceController(max_size=2, max_memory_mb=1.0)
+        
+        assert controller.try_add_item(0.5) == True
+        assert controller.try_add_item(0.6) == False  # 超过内存限制，不做修改
+        assert controller.current_size == 1
+        assert controller.current_memory_mb == 0.5
+        
+        assert controller.try_add_item(0.3) == True
+        assert controller.try_add_item(0.1) == False  # 超过大小限制
+        assert controller.current_size == 2
+        assert controller.current_memory_mb == 0.8
+    
     def test_remove_item(self):
         """测试移除项"""
         controller = ResourceController()
@@ -85,6 +103,22 @@ class TestResourceController:
         assert controller.current_size == 0
         assert controller.current_memory_mb == 0.0
     
+    def test_batch_add_and_remove_items(self):
+        """测试批量更新资源计数"""
+        controller = ResourceController()
+        controller.add_items(3, 0.6)
+        assert controller.current_size == 3
+        assert controller.current_memory_mb == 0.6
+        
+        controller.remove_items(2, 0.4)
+        assert controller.current_size == 1
+        assert controller.current_memory_mb == pytest.approx(0.2)
+        
+        # 测试不会变成负数
+        controller.remove_items(5)
+        assert controller.current_size == 0
+        assert controller.current_memory_mb == 0.0
+    
     def test_get_resource_usage(self):
         """测试获取资源使用情况"""
         controller = ResourceController(max_size=100, max_memory_mb=50)
@@ -98,6 +132,8 @@ class TestResourceController:
         assert usage['current_memory_mb'] == 15.0
         assert usage['max_memory_mb'] == 50
         assert usage['memory_usage_percent'] == 30.0
+        assert usage.size_usage_percent == 2.0
+        assert dict(usage)['max_size'] == 100
 
 
 class TestPriorityQueue:
@@ -141,16 +177,78 @@ class TestPriorityQueue:
         """测试相同优先级的FIFO顺序"""
         queue = PriorityQueue()
         
+        # 相同优先级按入队序号排序，不依赖时间戳，无需等待
         queue.put("first", priority=1)
-        time.sleep(0.01)  # 确保时间戳不同
         queue.put("second", priority=1)
-        time.sleep(0.01)
         queue.put("third", priority=1)
         
         assert queue.get() == "first"
         assert queue.get() == "second"
         assert queue.get() == "third"
     
+    def test_mixed_priority_after_same_priority(self):
+        """测试相同优先级入队后再加入不同优先级的项"""
+        queue = PriorityQueue()
+        
+        queue.put("first", priority=1)
+        queue.put("second", priority=1)
+        queue.remove("first")
+        queue.put("urgent", priority=0)
+        queue.put("third", priority=1)
+        
+        assert list(queue) == ["urgent", "second", "third"]
+        assert queue.get() == "urgent"
+        assert queue.get() == "second"
+        assert queue.get() == "third"
+        assert queue.get() is None
+        
+        # 取空后仍可正常使用
+        queue.put("again", priority=2)
+        assert queue.peek() == "again"
+    
+    def test_put_many(self):
+        """测试批量添加"""
+        queue = PriorityQueue()
+        queue.put("existing", priority=2)
+        
+        assert queue.put_many([("low", 5), ("high", 1, 0.2), ("medium", 3)]) == True
+        assert queue.qsize() == 4
+        assert queue.get_stats()['peak_size'] == 4
+        
+        assert queue.get() == "high"
+        assert queue.get() == "existing"
+        assert queue.get() == "medium"
+        assert queue.get() == "low"
+    
+    def test_put_many_resource_limit(self):
+        """测试批量添加超出资源限制时不添加任何项"""
+        queue = PriorityQueue(max_size=2)
+        
+        assert queue.put_many([("a", 1), ("b", 2), ("c", 3)]) == False
+        assert queue.qsize() == 0
+    
+    def test_get_many(self):
+        """测试批量获取"""
+        queue = PriorityQueue()
+        queue.put_many([("c", 3), ("a", 1), ("d", 4), ("b", 2)])
+        queue.remove("d")
+        
+        assert queue.get_many(2) == ["a", "b"]
+        assert queue.get_many() == ["c"]
+        assert queue.get_many() == []
+        assert queue.get_many(timeout=0.05) == []
+        assert queue.get_stats()['total_processed'] == 3
+        assert queue.get_stats()['resource_usage']['current_size'] == 0
+    
+    def test_from_iterable(self):
+        """测试批量构建队列"""
+        queue = PriorityQueue.from_iterable([("b", 2), ("a", 1)], name="bulk")
+        assert queue.name == "bulk"
+        assert list(queue) == ["a", "b"]
+        
+        with pytest.raises(ValueError):
+            PriorityQueue.from_iterable([("a", 1), ("b", 2)], max_size=1)
+    
     def test_peek_operation(self):
         """测试peek操作"""
         queue = PriorityQueue()
@@ -178,6 +276,21 @@ class TestPriorityQueue:
         assert queue.get() == "item3"
         assert queue.get() == None  # 队列已空
     
+    def test_remove_duplicate_data(self):
+        """测试相同数据多次入队时的移除"""
+        queue = PriorityQueue()
+        
+        queue.put("dup", priority=3)
+        queue.put("other", priority=2)
+        queue.put("dup", priority=1)
+        
+        # 移除最早入队的一项，另一项保留
+        assert queue.remove("dup") == True
+        assert sorted(queue.get_all_items(), key=lambda x: x[1]) == [("dup", 1), ("other", 2)]
+        assert queue.get() == "dup"
+        assert queue.remove("dup") == False
+        assert queue.get() == "other"
+    
     def test_update_priority(self):
         """测试更新优先级"""
         queue = PriorityQueue()
@@ -190,6 +303,40 @@ class TestPriorityQueue:
         assert queue.get() == "item1"  # 现在item1优先级更高
         assert queue.get() == "item2"
     
+    def test_tombstones_are_compacted(self):
+        """测试反复移除和更新优先级后作废项不会堆积"""
+        queue = PriorityQueue()
+        for i in range(10):
+            queue.put(i, priority=i)
+        
+        for k in range(20000):
+            queue.update_priority(k % 10, (k * 7) % 13)
+        for k in range(2000):
+            queue.remove(k % 10)
+            queue.put(k % 10, priority=(k * 3) % 11)
+        
+        assert queue.qsize() == 10
+        assert len(queue._queue) <= 2 * queue.qsize() + 1
+        assert sorted(queue) == list(range(10))
+    
+    def test_remove_and_update_unhashable_data(self):
+        """测试不可哈希数据的移除和优先级更新"""
+        queue = PriorityQueue()
+        
+        queue.put({"id": 1}, priority=1)
+        queue.put({"id": 2}, priority=2)
+        queue.put({"id": 3}, priority=3)
+        
+        assert queue.update_priority({"id": 3}, 0) == True
+        assert queue.remove({"id": 1}) == True
+        assert queue.remove({"id": 1}) == False
+        assert queue.qsize() == 2
+        
+        assert queue.peek() == {"id": 3}
+        assert queue.get() == {"id": 3}
+        assert queue.get() == {"id": 2}
+        assert queue.get() is None
+    
     def test_resource_limit(self):
         """测试资源限制"""
         queue = PriorityQueue(max_size=2, max_memory_mb=1.0)
@@ -200,6 +347,30 @@ class TestPriorityQueue:
         
         assert queue.qsize() == 2
     
+    def test_evict_on_full(self):
+        """测试队列已满时淘汰优先级最低的项"""
+        queue = PriorityQueue(max_size=2, evict_on_full=True)
+        
+        assert queue.put("low", priority=5) == True
+        assert queue.put("medium", priority=3) == True
+        assert queue.put("lower", priority=6) == False  # 不比最低的项更高，拒绝
+        assert queue.put("high", priority=1) == True    # 淘汰 "low"
+        
+        assert queue.qsize() == 2
+        assert queue.get_stats()['total_evicted'] == 1
+        assert list(queue) == ["high", "medium"]
+    
+    def test_evict_on_full_keeps_storage_bounded(self):
+        """测试持续淘汰时存储不会增长"""
+        queue = PriorityQueue(max_size=10, evict_on_full=True)
+        
+        for i in range(7010):
+            assert queue.put(i, priority=100000 - i) == True
+            assert len(queue._queue) <= 10
+        
+        assert queue.get_stats()['total_evicted'] == 7000
+        assert list(queue) == list(range(7009, 6999, -1))
+    
     def test_get_with_timeout(self):
         """测试带超时的get操作"""
         queue = PriorityQueue()
@@ -210,6 +381,19 @@ class TestPriorityQueue:
         queue.put("item1")
         assert queue.get(timeout=1.0) == "item1"
     
+    def test_get_with_timeout_wakes_on_put(self):
+        """测试带超时的get在有新项入队时被唤醒"""
+        import threading
+        
+        queue = PriorityQueue()
+        timer = threading.Timer(0.05, queue.put, args=("late_item",))
+        timer.start()
+        
+        start = time.monotonic()
+        assert queue.get(timeout=2.0) == "late_item"
+        assert time.monotonic() - start < 1.0
+        timer.join()
+    
     def test_clear_operation(self):
         """测试清空操作"""
         queue = PriorityQueue()
@@ -282,6 +466,99 @@ class TestPriorityQueue:
         assert "size=1" in repr_str
 
 
+class TestBucketPriorityQueue:
+    """测试桶式优先级队列"""
+    
+    def test_priority_order_and_fifo(self):
+        """测试按优先级出队，同优先级保持FIFO"""
+        queue = BucketPriorityQueue(max_priority=8)
+        
+        queue.put("low", priority=5)
+        queue.put("high_1", priority=1)
+        queue.put("high_2", priority=1)
+        queue.put("highest", priority=0)
+        
+        assert queue.peek() == "highest"
+        assert list(queue) == ["highest", "high_1", "high_2", "low"]
+        assert queue.get() == "highest"
+        assert queue.get_many(2) == ["high_1", "high_2"]
+        assert queue.get() == "low"
+        assert queue.get() is None
+        assert queue.empty()
+    
+    def test_priority_out_of_range(self):
+        """测试超出范围的优先级"""
+        queue = BucketPriorityQueue(max_priority=4)
+        
+        with pytest.raises(ValueError):
+            queue.put("item", priority=4)
+        with pytest.raises(ValueError):
+            queue.put("item", priority=-1)
+    
+    def test_remove_and_resource_limit(self):
+        """测试移除项和资源限制"""
+        queue = BucketPriorityQueue(max_size=2)
+        
+        assert queue.put("a", priority=3)
+        assert queue.put("b", priority=3)
+        assert not queue.put("c", priority=0)  # 超出最大项数
+        
+        assert queue.remove("a")
+        assert not queue.remove("missing")
+        assert queue.qsize() == 1
+        assert queue.get_stats()['resource_usage']['current_size'] == 1
+        assert queue.get() == "b"
+
+
+class TestSPSCQueue:
+    """测试单生产者/单消费者队列"""
+    
+    def test_fifo_and_capacity(self):
+        """测试FIFO顺序和容量限制"""
+        queue = SPSCQueue(max_size=2)
+        
+        assert queue.put("a")
+        assert queue.put("b")
+        assert not queue.put("c")  # 超出最大项数
+        assert queue.full()
+        
+        assert queue.peek() == "a"
+        assert list(queue) == ["a", "b"]
+        assert queue.get() == "a"
+        assert queue.get() == "b"
+        assert queue.get() is None
+        assert queue.get(timeout=0.01) is None
+        assert queue.empty()
+    
+    def test_producer_consumer(self):
+        """测试一个线程生产一个线程消费"""
+        import threading
+        
+        queue = SPSCQueue(max_size=100)
+        results = []
+        
+        def producer():
+            for i in range(1000):
+                while not queue.put(i):
+                    time.sleep(0)
+        
+        def consumer():
+            while len(results) < 1000:
+                item = queue.get(timeout=1.0)
+                assert item is not None
+                results.append(item)
+        
+        consumer_thread = threading.Thread(target=consumer)
+        producer_thread = threading.Thread(target=producer)
+        consumer_thread.start()
+        producer_thread.start()
+        producer_thread.join()
+        consumer_thread.join()
+        
+        assert results == list(range(1000))
+        assert queue.empty()
+
+
 class TestPriorityQueueIntegration:
     """集成测试"""
     
@@ -0,0 +1,60 @@
+"""
+决策树测试
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from nucleus.data.tree import Tree, TreeNode, create_default_tree
+
+
+class TestTree:
+    """测试决策树"""
+    
+    def test_sync_mock_condition_and_action(self):
+        """测试同步Mock作为条件和动作时按同步函数调用"""
+        tree = Tree()
+        condition = MagicMock(return_value=True)
+        action = MagicMock(return_value="sync_result")
+        tree.add_node("mock", condition=condition, action=action)
+        
+        assert asyncio.run(tree.evaluate({})) == "sync_result"
+        assert tree.evaluate_sync({}) == "sync_result"
+        assert condition.call_count == 2
+        assert action.call_count == 2
+    
+    def test_async_mock_condition_and_action(self):
+        """测试异步Mock作为条件和动作时被await"""
+        tree = Tree()
+        tree.add_node("mock", condition=AsyncMock(return_value=True),
+                      action=AsyncMock(return_value="async_result"))
+        
+        assert asyncio.run(tree.evaluate({})) == "async_result"
+        with pytest.raises(TypeError):
+            tree.evaluate_sync({})
+    
+    def test_default_tree_child_inserted_directly(self):
+        """测试直接向根节点插入子节点后默认树按通用评估"""
+        tree = create_default_tree()
+        tree.root.children.insert(0, TreeNode("override", condition=lambda ctx: True,
+                                              action=lambda ctx: "override_result"))
+        
+        assert asyncio.run(tree.evaluate({"command": "/x"})) == "override_result"
+        assert tree.evaluate_sync({"event_name": "e"}) == "override_result"
+    
+    def test_default_tree_children_cleared(self):
+        """测试清空后的默认树与通用决策树结果一致"""
+        generic = Tree()
+        
+        tree = create_default_tree()
+        tree.root.children.clear()
+        assert tree.evaluate_sync({"command": "/x"}) is generic.evaluate_sync({"command": "/x"}) is None
+        assert asyncio.run(tree.evaluate({})) is None
+        
+        tree = create_default_tree()
+        tree.clear()
+        assert tree.evaluate_sync({"command": "/x"}) is None
+        assert asyncio.run(tree.evaluate({})) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -6,20 +6,40 @@
 
 import subprocess
 import sys
-import os
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# setup.py 中必须包含的字段
+REQUIRED_FIELDS = [
+    'name="decorator-framework"',
+    'version=',
+    'author=',
+    'author_email=',
+    'description=',
+    'url=',
+]
+# 所有字段合并为一个正则，只扫描一遍文件
+REQUIRED_FIELDS_RE = re.compile(r'\b(' + '|'.join(map(re.escape, REQUIRED_FIELDS)) + ')')
+
 def run_command(cmd, description):
-    """运行命令并检查返回码"""
+    """运行命令并检查返回码，实时输出命令日志"""
     print(f"\n🔄 {description}...")
-    try:
-        result = subprocess.run(cmd, shell=True, check=True, capture_output=True, text=True)
-        print(f"✅ {description} 成功")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ {description} 失败")
-        print(f"错误信息: {e.stderr}")
+    with subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE,
+                          stderr=subprocess.STDOUT, text=True) as proc:
+        for line in proc.stdout:
+            print(line, end="")
+    if proc.returncode != 0:
+        print(f"❌ {description} 失败 (返回码: {proc.returncode})")
         return False
+    print(f"✅ {description} 成功")
+    return True
+
+def remove_dir(path):
+    """删除目录并返回其路径"""
+    shutil.rmtree(path, ignore_errors=True)
+    return path
 
 def check_setup():
     """检查setup.py中的必要配置"""
@@ -31,19 +51,8 @@ def check_setup():
     content = setup_file.read_text(encoding='utf-8')
     
     # 检查必要的字段
-    required_fields = [
-        'name="decorator-framework"',
-        'version=',
-        'author=',
-        'author_email=',
-        'description=',
-        'url=',
-    ]
-    
-    missing_fields = []
-    for field in required_fields:
-        if field not in content:
-            missing_fields.append(field)
+    found_fields = set(REQUIRED_FIELDS_RE.findall(content))
+    missing_fields = [field for field in REQUIRED_FIELDS if field not in found_fields]
     
     if missing_fields:
         print(f"⚠️  setup.py中缺少以下字段: {', '.join(missing_fields)}")
@@ -63,10 +72,11 @@ def main():
     
     # 步骤2: 清理旧的构建文件
     print("\n🧹 清理旧的构建文件...")
-    for folder in ['build', 'dist', '*.egg-info']:
-        if os.path.exists(folder):
-            import shutil
-            shutil.rmtree(folder)
+    # *.egg-info 需要通配符展开；各目录互不相关，并行删除
+    folders = [path for path in [Path('build'), Path('dist'), *Path('.').glob('*.egg-info')]
+               if path.is_dir()]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for folder in executor.map(remove_dir, folders):
             print(f"已删除: {folder}")
     
     # 步骤3: 构建包
@@ -17,6 +17,9 @@ from decorators import on, command_on, time_on, re_on
 from nucleus.dispatcher import EventDispatcher, DecisionCommandDispatcher
 from nucleus.core.task_manager import TaskManager
 
+# 预编译的正则，模块加载时只编译一次
+_TEST_RE = re.compile(r"^test$")
+
 print("🔍 开始验证文档中的代码示例...")
 print("=" * 60)
 
@@ -94,7 +97,7 @@ except Exception as e:
 # 测试5: 正则表达式装饰器
 print("\n📋 测试5: 正则表达式装饰器")
 try:
-    @re_on("test_regex", r"^test$", re.compile(r"^test$")).execute()
+    @re_on("test_regex", r"^test$", _TEST_RE).execute()
     async def test_regex_handler(content: str):
         return f"正则匹配成功: {content}"
     
@@ -169,7 +172,7 @@ async def test_task_manager():
         task_manager = TaskManager()
         
         async def sample_task(name: str):
-            await asyncio.sleep(0.1)
+            await asyncio.sleep(0)  # 让出一次事件循环，模拟异步任务
             return f"任务 {name} 完成"
         
         # 创建任务